@@ -9,11 +9,14 @@ Check doc/libtest.txt for information.
 tests = ['surface_test',
          'rect_test',
          'draw_test',
+         'font_test',
          'transform_test',
          'surfarray_test',
          'mask_test',
          'color_test',
          'cursor_test',
+         'display_test',
+         'image_test',
          'sprite_test',
          'event_test',
          'time_test',
@@ -48,6 +48,7 @@ from pyjsdl import color
 from pyjsdl import font
 from pyjsdl import vector
 from pyjsdl import sprite
+from pyjsdl import replay
 from pyjsdl import cursors
 from pyjsdl import version
 from pyjsdl.constants import *
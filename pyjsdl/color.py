@@ -362,6 +362,41 @@ class Color:
         return self.__str__()
 
 
+_cache = __new__(Map())
+_cache_size = 256
+
+
+def _intern(color):
+    """
+    Return shared Color of color argument with css string in _css attribute.
+
+    The Color is cached by packed rgba value, with oldest entry evicted
+    beyond cache size, and is not to be modified as it is shared.
+    """
+    if hasattr(color, 'a'):
+        r, g, b, a = color.r, color.g, color.b, color.a
+    elif isinstance(color, (tuple, list)):
+        r, g, b = color[0], color[1], color[2]
+        a = color[3] if len(color) == 4 else 255
+    else:
+        _color = Color(color)
+        r, g, b, a = _color.r, _color.g, _color.b, _color.a
+    if ((r & 0xff) != r or (g & 0xff) != g or
+        (b & 0xff) != b or (a & 0xff) != a):
+        _color = Color(r, g, b, a)
+        _color._css = str(_color)
+        return _color
+    key = (a << 24) | (r << 16) | (g << 8) | b
+    if _cache.has(key):
+        return _cache.js_get(key)
+    if _cache.size >= _cache_size:
+        _cache.delete(_cache.js_keys().js_next().value)
+    _color = Color(r, g, b, a)
+    _color._css = str(_color)
+    _cache.set(key, _color)
+    return _color
+
+
 def _rgb_to_cmy(r, g, b):
     r, g, b = r/255.0, g/255.0, b/255.0
     c, m, y = 1-r, 1-g, 1-b
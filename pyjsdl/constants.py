@@ -180,6 +180,16 @@ APPINPUTFOCUS = 1
 APPACTIVE = 2
 WINDOWENTER = 32783
 WINDOWLEAVE = 32784
+BLEND_ADD = 1
+BLEND_SUB = 2
+BLEND_MULT = 3
+BLEND_MIN = 4
+BLEND_MAX = 5
+BLEND_RGB_ADD = 1
+BLEND_RGB_SUB = 2
+BLEND_RGB_MULT = 3
+BLEND_RGB_MIN = 4
+BLEND_RGB_MAX = 5
 DOUBLEBUF = 0x40000000
 FULLSCREEN = -0x80000000
 HWACCEL = 256
@@ -26,10 +26,15 @@ _wnd = None
 
 class Canvas(Surface):
 
-    def __init__(self, size):
+    def __init__(self, size, ctx_attr=None, direct=False):
+        if ctx_attr is not None:
+            self._ctx_attr = ctx_attr
         Surface.__init__(self, size)
         self.setID('__canvas__')
-        self.surface = Surface(size)
+        if not direct:
+            self.surface = Surface(size)
+        else:
+            self.surface = self._direct_surface(size)
         self.callback = None
         self.time = Time()
         self.event = env.event
@@ -60,11 +65,19 @@ class Canvas(Surface):
         self.keyHeld = self.event.keyHeld
         self.event._initiate_touch_listener(self)
         self._touch_callback = self.event.touchlistener.callback
+        self._touch_pending = False
+        self._frame = 0
+        self._frame_hooks = []
+        if self.event._recycleHook is not None:
+            self._frame_hooks.append(self.event._recycleHook)
         self._clientRect = None
         self._clientRect_update_timeout = False
         self._rect_list = []
         self._rect_len = 0
         self._rect_num = 0
+        self._rect_coverage = 0.75
+        self._rect_merge_max = 64
+        self._rect_saved = 0
         self._framerate = 0
         self._frametime = 0
         self._rendertime = self.time.time()
@@ -72,6 +85,25 @@ class Canvas(Surface):
         self.run = None
         self.initialized = False
 
+    def _direct_surface(self, size):
+        #display surface distinct from canvas, drawing on canvas element
+        surface = Surface(size, Const.SRCALPHA)
+        surface._canvas = self._canvas
+        surface._element = self._element
+        surface.canvas = self.canvas
+        surface._ctx = self._ctx
+        return surface
+
+    def _replace(self, canvas):
+        #take page position, frame count, frame hooks and touch callbacks
+        #of previous canvas
+        element = canvas.getElement()
+        if element.parentNode:
+            element.parentNode.replaceChild(self.getElement(), element)
+        self._frame = canvas._frame
+        self._frame_hooks = canvas._frame_hooks
+        self._touch_callback.extend(canvas._touch_callback)
+
     def _initiate(self):
         global _canvas, _ctx, _img, _wnd
         panel = RootPanel()
@@ -251,21 +283,43 @@ class Canvas(Surface):
         self.onTouchStart(event)
 
     def onTouchStart(self, event):
+        if self._touch_pending:
+            self._touch_flush()
+        if self.event._coalesceTouch:
+            self.event._touchTrack(event)
         for callback in self._touch_callback:
             callback.onTouchStart(event)
 
     def onTouchEnd(self, event):
+        if self._touch_pending:
+            self._touch_flush()
+        if self.event._coalesceTouch:
+            self.event._touchTrack(event)
         for callback in self._touch_callback:
             callback.onTouchEnd(event)
 
     def onTouchMove(self, event):
+        if self.event._coalesceTouch:
+            self.event._touchMove(event)
+            self._touch_pending = True
+            return
         for callback in self._touch_callback:
             callback.onTouchMove(event)
 
     def onTouchCancel(self, event):
+        if self._touch_pending:
+            self._touch_flush()
+        if self.event._coalesceTouch:
+            self.event._touchTrack(event)
         for callback in self._touch_callback:
             callback.onTouchCancel(event)
 
+    def _touch_flush(self):
+        self._touch_pending = False
+        for event in self.event._touchFlush():
+            for callback in self._touch_callback:
+                callback.onTouchMove(event)
+
     def preventContextMenu(self, setting=True):
         if setting:
             if self.onContextMenu: return
@@ -320,13 +374,106 @@ class Canvas(Surface):
         self._rendertime = timestamp
 
     def render(self):
+        if not self._rect_num:
+            return
+        rect_count = self._rect_num
+        if self._coalesce() > self._rect_coverage:
+            _ctx.drawImage(_img, 0, 0)
+            self._rect_num = 0
+            self._rect_saved += rect_count - 1
+            return
+        self._rect_saved += rect_count - self._rect_num
         while self._rect_num:
             rect = self._rect_list[self._rect_num-1]
-            x,y,width,height = rect.x,rect.y,rect.width,rect.height
+            x,y,width,height = rect._x,rect._y,rect._width,rect._height
             _ctx.drawImage(_img, x,y,width,height, x,y,width,height)
             self._rect_num -= 1
 
+    def _coalesce(self):
+        #clip repaint rects to canvas, merge rects when union area does not
+        #exceed their summed area, which covers contained, adjacent aligned
+        #and largely overlapping rects, and return fraction of canvas covered;
+        #skip the pairwise merge when summed area exceeds coverage, and use
+        #the bounding rect when rect count exceeds merge limit
+        rects = self._rect_list
+        width = self.width
+        height = self.height
+        num = 0
+        area = 0
+        for i in range(self._rect_num):
+            rect = rects[i]
+            x1 = rect._x if rect._x > 0 else 0
+            y1 = rect._y if rect._y > 0 else 0
+            x2 = min(rect._x + rect._width, width)
+            y2 = min(rect._y + rect._height, height)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            rect._x = x1
+            rect._y = y1
+            rect._width = x2 - x1
+            rect._height = y2 - y1
+            rects[i] = rects[num]
+            rects[num] = rect
+            area += rect._width * rect._height
+            num += 1
+        self._rect_num = num
+        if area > self._rect_coverage * width * height:
+            return area / (width * height)
+        if num > self._rect_merge_max:
+            r1 = rects[0]
+            x1, y1 = r1._x, r1._y
+            x2, y2 = r1._x + r1._width, r1._y + r1._height
+            for i in range(1, num):
+                r2 = rects[i]
+                x1 = r2._x if r2._x < x1 else x1
+                y1 = r2._y if r2._y < y1 else y1
+                x2 = max(r2._x + r2._width, x2)
+                y2 = max(r2._y + r2._height, y2)
+            r1._x = x1
+            r1._y = y1
+            r1._width = x2 - x1
+            r1._height = y2 - y1
+            self._rect_num = 1
+            return (r1._width * r1._height) / (width * height)
+        merged = True
+        while merged:
+            merged = False
+            i = 0
+            while i < num:
+                r1 = rects[i]
+                j = i + 1
+                while j < num:
+                    r2 = rects[j]
+                    x1 = r1._x if r1._x < r2._x else r2._x
+                    y1 = r1._y if r1._y < r2._y else r2._y
+                    x2 = max(r1._x + r1._width, r2._x + r2._width)
+                    y2 = max(r1._y + r1._height, r2._y + r2._height)
+                    if ((x2-x1) * (y2-y1) <=
+                            r1._width*r1._height + r2._width*r2._height):
+                        r1._x = x1
+                        r1._y = y1
+                        r1._width = x2 - x1
+                        r1._height = y2 - y1
+                        num -= 1
+                        rects[j] = rects[num]
+                        rects[num] = r2
+                        merged = True
+                    else:
+                        j += 1
+                i += 1
+        self._rect_num = num
+        area = 0
+        for i in range(num):
+            area += rects[i]._width * rects[i]._height
+        return area / (width * height)
+
     def _run(self):
+        self._frame += 1
+        if len(self._frame_hooks):
+            for hook in self._frame_hooks[:]:
+                hook()
+        if self._touch_pending:
+            self._touch_flush()
         self.callback.run()
 
 
@@ -396,21 +543,41 @@ class Display:
             self._image_list = []
             self._image_loading = False
             self._canvas_init = False
+            self._direct = False
             self._callbackAF = CallbackAF()
             self._initialized = True
 
+    # __pragma__ ('kwargs')
+
     def set_mode(self, size, flags=None, *args, **kwargs):
         """
         Setup the display Surface.
 
         Argument size (width, height) of surface.
+        Optional keyword argument direct (default False) for the display
+        Surface to draw directly on the visible canvas, so flip and update
+        have no repaint, rather than a surface buffer repainted to canvas.
+        Optional keyword argument ctx_attr of canvas context attributes,
+        such as {'alpha':False, 'desynchronized':True} for opaque and
+        low-latency display.
         Return a reference to the display Surface.
         """
-        self.canvas = Canvas(size)
+        if 'ctx_attr' in kwargs:
+            ctx_attr = kwargs['ctx_attr']
+        else:
+            ctx_attr = None
+        if 'direct' in kwargs:
+            self._direct = kwargs['direct']
+        else:
+            self._direct = False
+        previous = self.canvas
+        self.canvas = Canvas(size, ctx_attr, self._direct)
         env.set_env('canvas', self.canvas)
         self.frame = document.body
         env.set_env('frame', self.frame)
         self.panel = self.canvas._initiate()
+        if previous is not None:
+            self.canvas._replace(previous)
         self.vpanel = None
         self.textbox = None
         self.textarea = None
@@ -419,13 +586,19 @@ class Display:
         self.surface = self.canvas.surface
         self.surface._display = self
         self._surface_rect = self.surface.get_rect()
-        if self._canvas_init and not self._image_loading:
+        if previous is not None and previous.initialized:
+            self.canvas.set_callback(previous.callback)
+            self.canvas.initialized = True
+            self.canvas.run = self.canvas._run
+        elif self._canvas_init and not self._image_loading:
             self.canvas.set_callback(self._callback)
             self._callback = None
             self.canvas.start()
             self._callbackAF.stop()
         return self.surface
 
+    # __pragma__ ('nokwargs')
+
     def setup(self, callback, images=None):
         """
         Initialize Canvas for script execution.
@@ -637,6 +810,8 @@ class Display:
         """
         Repaint display.
         """
+        if self._direct:
+            return None
         self.canvas._ctx.drawImage(self.surface.canvas, 0, 0)
         return None
 
@@ -646,6 +821,8 @@ class Display:
 
         Optional rect or rect list to specify regions to repaint.
         """
+        if self._direct:
+            return None
         if hasattr(rect_list, 'append'):
             _update(self.canvas, rect_list)
         elif rect_list:
@@ -657,6 +834,22 @@ class Display:
     def js_update(self, rect_list=None):
         self.update(rect_list)
 
+    def set_update_coverage(self, fraction=0.75):
+        """
+        Set coverage of display beyond which update repaints whole display.
+
+        Regions to repaint are merged before render, and when their area
+        exceeds the fraction of the display a single full repaint is used.
+        """
+        self.canvas._rect_coverage = fraction
+        return None
+
+    def get_update_saved(self):
+        """
+        Return count of region repaints saved by merging update regions.
+        """
+        return self.canvas._rect_saved
+
 
 def _update(canvas, rect_list):
     for rect in rect_list:
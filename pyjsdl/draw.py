@@ -9,11 +9,14 @@ The module provides functions to draw shapes on a surface.
 
 from math import pi as _pi
 from pyjsdl.rect import Rect
-from pyjsdl.color import Color
+from pyjsdl.color import _intern
+from pyjsdl.util import LRUCache
 
 
 _return_rect = True
 
+_path_cache = None
+
 
 def rect(surface, color, rect, width=0):
     """
@@ -29,24 +32,10 @@ def rect(surface, color, rect, width=0):
         _rect = Rect(rect)
     if width:
         surface.setLineWidth(width)
-        # __pragma__ ('opov')
-        if surface._stroke_style != color:
-            # __pragma__ ('noopov')
-            surface._stroke_style = color
-            if hasattr(color, 'a'):
-                surface.setStrokeStyle(color)
-            else:
-                surface.setStrokeStyle(Color(color))
+        surface.setStrokeStyle(_intern(color)._css)
         surface.strokeRect(_rect.x, _rect.y, _rect.width, _rect.height)
     else:
-        # __pragma__ ('opov')
-        if surface._fill_style != color:
-            # __pragma__ ('noopov')
-            surface._fill_style = color
-            if hasattr(color, 'a'):
-                surface.setFillStyle(color)
-            else:
-                surface.setFillStyle(Color(color))
+        surface.setFillStyle(_intern(color)._css)
         surface.fillRect(_rect.x, _rect.y, _rect.width, _rect.height)
     if not _return_rect:
         return None
@@ -68,24 +57,10 @@ def circle(surface, color, position, radius, width=0):
     surface.arc(position[0], position[1], radius, 0, 2*_pi, False)
     if width:
         surface.setLineWidth(width)
-        # __pragma__ ('opov')
-        if surface._stroke_style != color:
-            # __pragma__ ('noopov')
-            surface._stroke_style = color
-            if hasattr(color, 'a'):
-                surface.setStrokeStyle(color)
-            else:
-                surface.setStrokeStyle(Color(color))
+        surface.setStrokeStyle(_intern(color)._css)
         surface.stroke()
     else:
-        # __pragma__ ('opov')
-        if surface._fill_style != color:
-            # __pragma__ ('noopov')
-            surface._fill_style = color
-            if hasattr(color, 'a'):
-                surface.setFillStyle(color)
-            else:
-                surface.setFillStyle(Color(color))
+        surface.setFillStyle(_intern(color)._css)
         surface.fill()
     if not _return_rect:
         return None
@@ -109,39 +84,29 @@ def ellipse(surface, color, rect, width=0):
         _rect = rect
     else:
         _rect = Rect(rect)
-    surface.saveContext()
-    surface.translate(_rect.x + int(_rect.width/2),
-                      _rect.y + int(_rect.height/2))
-    if _rect.width >= _rect.height:
-        surface.scale(_rect.width / (_rect.height*1.0), 1)
-        radius = int(_rect.height/2)
-    else:
-        surface.scale(1, _rect.height / (_rect.width*1.0))
-        radius = int(_rect.width/2)
-    surface.beginPath()
-    surface.arc(0, 0, radius, 0, 2*_pi, False)
-    if width:
-        surface.setLineWidth(width)
-        # __pragma__ ('opov')
-        if surface._stroke_style != color:
-            # __pragma__ ('noopov')
-            surface._stroke_style = color
-            if hasattr(color, 'a'):
-                surface.setStrokeStyle(color)
-            else:
-                surface.setStrokeStyle(Color(color))
-        surface.stroke()
+    if _path_cache is not None:
+        path = _ellipse_path(1, _rect.width, _rect.height, 0, 0)
+        _draw_path(surface, color, path, _rect.x, _rect.y, width)
     else:
-        # __pragma__ ('opov')
-        if surface._fill_style != color:
-            # __pragma__ ('noopov')
-            surface._fill_style = color
-            if hasattr(color, 'a'):
-                surface.setFillStyle(color)
-            else:
-                surface.setFillStyle(Color(color))
-        surface.fill()
-    surface.restoreContext()
+        surface.saveContext()
+        surface.translate(_rect.x + int(_rect.width/2),
+                          _rect.y + int(_rect.height/2))
+        if _rect.width >= _rect.height:
+            surface.scale(_rect.width / (_rect.height*1.0), 1)
+            radius = int(_rect.height/2)
+        else:
+            surface.scale(1, _rect.height / (_rect.width*1.0))
+            radius = int(_rect.width/2)
+        surface.beginPath()
+        surface.arc(0, 0, radius, 0, 2*_pi, False)
+        if width:
+            surface.setLineWidth(width)
+            surface.setStrokeStyle(_intern(color)._css)
+            surface.stroke()
+        else:
+            surface.setFillStyle(_intern(color)._css)
+            surface.fill()
+        surface.restoreContext()
     if not _return_rect:
         return None
     if surface._display:
@@ -162,31 +127,21 @@ def arc(surface, color, rect, start_angle, stop_angle, width=1):
         _rect = rect
     else:
         _rect = Rect(rect)
-    if _rect.width == _rect.height:
+    if _path_cache is not None:
+        path = _ellipse_path(2 if width else 3, _rect.width, _rect.height,
+                             start_angle, stop_angle)
+        _draw_path(surface, color, path, _rect.x, _rect.y, width)
+    elif _rect.width == _rect.height:
         surface.beginPath()
         surface.arc(_rect.x + int(_rect.width/2), _rect.y + int(_rect.height/2),
                     int(_rect.width/2), -start_angle, -stop_angle, True)
         if width:
             surface.setLineWidth(width)
-            # __pragma__ ('opov')
-            if surface._stroke_style != color:
-                # __pragma__ ('noopov')
-                surface._stroke_style = color
-                if hasattr(color, 'a'):
-                    surface.setStrokeStyle(color)
-                else:
-                    surface.setStrokeStyle(Color(color))
+            surface.setStrokeStyle(_intern(color)._css)
             surface.stroke()
         else:
             surface.closePath()
-            # __pragma__ ('opov')
-            if surface._fill_style != color:
-                # __pragma__ ('noopov')
-                surface._fill_style = color
-                if hasattr(color, 'a'):
-                    surface.setFillStyle(color)
-                else:
-                    surface.setFillStyle(Color(color))
+            surface.setFillStyle(_intern(color)._css)
             surface.fill()
     else:
         surface.saveContext()
@@ -202,25 +157,11 @@ def arc(surface, color, rect, start_angle, stop_angle, width=1):
         surface.arc(0, 0, radius, -start_angle, -stop_angle, True)
         if width:
             surface.setLineWidth(width)
-            # __pragma__ ('opov')
-            if surface._stroke_style != color:
-                # __pragma__ ('noopov')
-                surface._stroke_style = color
-                if hasattr(color, 'a'):
-                    surface.setStrokeStyle(color)
-                else:
-                    surface.setStrokeStyle(Color(color))
+            surface.setStrokeStyle(_intern(color)._css)
             surface.stroke()
         else:
             surface.closePath()
-            # __pragma__ ('opov')
-            if surface._fill_style != color:
-                # __pragma__ ('noopov')
-                surface._fill_style = color
-                if hasattr(color, 'a'):
-                    surface.setFillStyle(color)
-                else:
-                    surface.setFillStyle(Color(color))
+            surface.setFillStyle(_intern(color)._css)
             surface.fill()
         surface.restoreContext()
     if not _return_rect:
@@ -239,6 +180,8 @@ def polygon(surface, color, pointlist, width=0):
     Optional width argument of outline, which defaults to 0 for filled shape.
     Return bounding Rect.
     """
+    if _path_cache is not None:
+        return _polygon_path(surface, color, pointlist, width)
     surface.beginPath()
     surface.moveTo(*pointlist[0])
     for point in pointlist[1:]:
@@ -246,24 +189,10 @@ def polygon(surface, color, pointlist, width=0):
     surface.closePath()
     if width:
         surface.setLineWidth(width)
-        # __pragma__ ('opov')
-        if surface._stroke_style != color:
-            # __pragma__ ('noopov')
-            surface._stroke_style = color
-            if hasattr(color, 'a'):
-                surface.setStrokeStyle(color)
-            else:
-                surface.setStrokeStyle(Color(color))
+        surface.setStrokeStyle(_intern(color)._css)
         surface.stroke()
     else:
-        # __pragma__ ('opov')
-        if surface._fill_style != color:
-            # __pragma__ ('noopov')
-            surface._fill_style = color
-            if hasattr(color, 'a'):
-                surface.setFillStyle(color)
-            else:
-                surface.setFillStyle(Color(color))
+        surface.setFillStyle(_intern(color)._css)
         surface.fill()
     if not _return_rect:
         return None
@@ -291,14 +220,7 @@ def line(surface, color, point1, point2, width=1):
     surface.moveTo(*point1)
     surface.lineTo(*point2)
     surface.setLineWidth(width)
-    # __pragma__ ('opov')
-    if surface._stroke_style != color:
-        # __pragma__ ('noopov')
-        surface._stroke_style = color
-        if hasattr(color, 'a'):
-            surface.setStrokeStyle(color)
-        else:
-            surface.setStrokeStyle(Color(color))
+    surface.setStrokeStyle(_intern(color)._css)
     surface.stroke()
     if not _return_rect:
         return None
@@ -329,14 +251,7 @@ def lines(surface, color, closed, pointlist, width=1):
     if closed:
         surface.closePath()
     surface.setLineWidth(width)
-    # __pragma__ ('opov')
-    if surface._stroke_style != color:
-        # __pragma__ ('noopov')
-        surface._stroke_style = color
-        if hasattr(color, 'a'):
-            surface.setStrokeStyle(color)
-        else:
-            surface.setStrokeStyle(Color(color))
+    surface.setStrokeStyle(_intern(color)._css)
     surface.stroke()
     if not _return_rect:
         return None
@@ -374,6 +289,334 @@ def aalines(surface, color, closed, pointlist, blend=1):
     return rect
 
 
+def rects(surface, color, geometry, width=0):
+    """
+    Draw batch of rectangle shapes.
+
+    Arguments include surface to draw, color, and geometry as a flat
+    sequence or typed array of x, y, width, height of each rectangle.
+    The color argument can be a list of colors of each rectangle, drawn
+    in a single path for each color.
+    Optional width argument of outline, which defaults to 0 for filled shape.
+    Return union bounding Rect.
+    """
+    _batch_draw(surface, color, geometry, 4, _path_rect, width, width)
+    if not _return_rect:
+        return None
+    xmin = ymin = xmax = ymax = None
+    for i in range(0, len(geometry)-3, 4):
+        x = geometry[i]
+        y = geometry[i+1]
+        if xmin is None:
+            xmin = xmax = x
+            ymin = ymax = y
+        xmin = min(xmin, x)
+        ymin = min(ymin, y)
+        xmax = max(xmax, x + geometry[i+2])
+        ymax = max(ymax, y + geometry[i+3])
+    return _batch_rect(surface, xmin, ymin, xmax, ymax)
+
+
+def circles(surface, color, geometry, width=0):
+    """
+    Draw batch of circular shapes.
+
+    Arguments include surface to draw, color, and geometry as a flat
+    sequence or typed array of x, y, radius of each circle.
+    The color argument can be a list of colors of each circle, drawn
+    in a single path for each color.
+    Optional width argument of outline, which defaults to 0 for filled shape.
+    Return union bounding Rect.
+    """
+    _batch_draw(surface, color, geometry, 3, _path_circle, width, width)
+    if not _return_rect:
+        return None
+    xmin = ymin = xmax = ymax = None
+    for i in range(0, len(geometry)-2, 3):
+        x = geometry[i]
+        y = geometry[i+1]
+        r = geometry[i+2]
+        if xmin is None:
+            xmin = xmax = x
+            ymin = ymax = y
+        xmin = min(xmin, x - r)
+        ymin = min(ymin, y - r)
+        xmax = max(xmax, x + r)
+        ymax = max(ymax, y + r)
+    return _batch_rect(surface, xmin, ymin, xmax, ymax)
+
+
+def lines_batch(surface, color, geometry, width=1):
+    """
+    Draw batch of lines.
+
+    Arguments include surface to draw, color, and geometry as a flat
+    sequence or typed array of x1, y1, x2, y2 of each line.
+    The color argument can be a list of colors of each line, drawn
+    in a single path for each color.
+    Optional width argument of line.
+    Return union bounding Rect.
+    """
+    _batch_draw(surface, color, geometry, 4, _path_line, width, True)
+    if not _return_rect:
+        return None
+    xmin = ymin = xmax = ymax = None
+    for i in range(0, len(geometry)-3, 4):
+        if xmin is None:
+            xmin = xmax = geometry[i]
+            ymin = ymax = geometry[i+1]
+        xmin = min(xmin, geometry[i], geometry[i+2])
+        ymin = min(ymin, geometry[i+1], geometry[i+3])
+        xmax = max(xmax, geometry[i], geometry[i+2])
+        ymax = max(ymax, geometry[i+1], geometry[i+3])
+    if xmin is not None:
+        xmax += 1
+        ymax += 1
+    return _batch_rect(surface, xmin, ymin, xmax, ymax)
+
+
+def points(surface, color, geometry, size=1):
+    """
+    Draw batch of points.
+
+    Arguments include surface to draw, color, and geometry as a flat
+    sequence or typed array of x, y of each point.
+    The color argument can be a list of colors of each point, drawn
+    in a single path for each color.
+    Optional size argument of point square side, which defaults to 1.
+    Return union bounding Rect.
+    """
+    path_point = lambda ctx, g, i: ctx.rect(g[i], g[i+1], size, size)
+    _batch_draw(surface, color, geometry, 2, path_point, 0, False)
+    if not _return_rect:
+        return None
+    xmin = ymin = xmax = ymax = None
+    for i in range(0, len(geometry)-1, 2):
+        x = geometry[i]
+        y = geometry[i+1]
+        if xmin is None:
+            xmin = xmax = x
+            ymin = ymax = y
+        xmin = min(xmin, x)
+        ymin = min(ymin, y)
+        xmax = max(xmax, x + size)
+        ymax = max(ymax, y + size)
+    return _batch_rect(surface, xmin, ymin, xmax, ymax)
+
+
+def _batch_draw(surface, color, geometry, stride, path_shape, width, stroke):
+    """
+    Draw shapes of geometry in a path for each color.
+
+    Shapes with a list of colors are grouped by color, so overlapping
+    shapes of different color may not be drawn in order.
+    """
+    count = len(geometry) // stride
+    ctx = surface._ctx
+    for css, indices in _batch_styles(color, count):
+        surface.beginPath()
+        if indices is None:
+            for i in range(0, count*stride, stride):
+                path_shape(ctx, geometry, i)
+        else:
+            for i in indices:
+                path_shape(ctx, geometry, i*stride)
+        if stroke:
+            surface.setLineWidth(width)
+            surface.setStrokeStyle(css)
+            surface.stroke()
+        else:
+            surface.setFillStyle(css)
+            surface.fill()
+
+
+def _batch_styles(color, count):
+    """
+    Return list of [css, indices] of shapes, with indices None for all.
+    """
+    if (isinstance(color, (list, tuple)) and count and len(color) == count
+            and not isinstance(color[0], (int, float))):
+        styles = []
+        index = {}
+        for i in range(count):
+            css = _intern(color[i])._css
+            if css not in index:
+                index[css] = len(styles)
+                styles.append([css, []])
+            styles[index[css]][1].append(i)
+        return styles
+    return [[_intern(color)._css, None]]
+
+
+def _path_rect(ctx, geometry, i):
+    ctx.rect(geometry[i], geometry[i+1], geometry[i+2], geometry[i+3])
+
+
+def _path_circle(ctx, geometry, i):
+    ctx.moveTo(geometry[i] + geometry[i+2], geometry[i+1])
+    ctx.arc(geometry[i], geometry[i+1], geometry[i+2], 0, 2*_pi, False)
+
+
+def _path_line(ctx, geometry, i):
+    ctx.moveTo(geometry[i], geometry[i+1])
+    ctx.lineTo(geometry[i+2], geometry[i+3])
+
+
+def _batch_rect(surface, xmin, ymin, xmax, ymax):
+    if xmin is None:
+        return Rect(0, 0, 0, 0)
+    rect = Rect(xmin, ymin, xmax-xmin, ymax-ymin)
+    if surface._display:
+        return surface._display._surface_rect.clip(rect)
+    else:
+        return surface.get_rect().clip(rect)
+
+
+def _polygon_path(surface, color, pointlist, width):
+    """
+    Draw polygon from cached path and bounds relative to first point.
+
+    The path is keyed by a numeric hash of the relative points, and the
+    points stored with the path are compared on retrieval.
+    """
+    x0 = pointlist[0][0]
+    y0 = pointlist[0][1]
+    num = len(pointlist)
+    key = num
+    for i in range(1, num):
+        key = (Math.imul(key, 31) + (pointlist[i][0] - x0)) | 0
+        key = (Math.imul(key, 31) + (pointlist[i][1] - y0)) | 0
+    entry = _path_cache.get(key)
+    if entry is not None:
+        points = entry[5]
+        if len(points) == 2*num - 2:
+            for i in range(1, num):
+                if (points[2*i-2] != pointlist[i][0] - x0 or
+                    points[2*i-1] != pointlist[i][1] - y0):
+                    entry = None
+                    break
+        else:
+            entry = None
+    if entry is None:
+        path = __new__(Path2D())
+        path.moveTo(0, 0)
+        points = []
+        xmin = xmax = ymin = ymax = 0
+        for i in range(1, num):
+            x = pointlist[i][0] - x0
+            y = pointlist[i][1] - y0
+            path.lineTo(x, y)
+            points.append(x)
+            points.append(y)
+            xmin = min(xmin, x)
+            xmax = max(xmax, x)
+            ymin = min(ymin, y)
+            ymax = max(ymax, y)
+        path.closePath()
+        entry = [path, xmin, ymin, xmax-xmin+1, ymax-ymin+1, points]
+        _path_cache.set(key, entry)
+    _draw_path(surface, color, entry[0], x0, y0, width)
+    if not _return_rect:
+        return None
+    rect = Rect(x0+entry[1], y0+entry[2], entry[3], entry[4])
+    if surface._display:
+        return surface._display._surface_rect.clip(rect)
+    else:
+        return surface.get_rect().clip(rect)
+
+
+def _ellipse_path(shape, width, height, start_angle, stop_angle):
+    """
+    Return cached path of ellipse (shape 1), arc (2) or closed arc (3).
+
+    The path is keyed by a numeric hash of shape, size and angles, and the
+    parameters stored with the path are compared on retrieval.
+    """
+    key = shape
+    key = (Math.imul(key, 31) + width) | 0
+    key = (Math.imul(key, 31) + height) | 0
+    key = (Math.imul(key, 31) + Math.round(start_angle * 1000)) | 0
+    key = (Math.imul(key, 31) + Math.round(stop_angle * 1000)) | 0
+    entry = _path_cache.get(key)
+    if entry is not None:
+        params = entry[5]
+        if (len(params) != 5 or params[0] != shape or
+            params[1] != width or params[2] != height or
+            params[3] != start_angle or params[4] != stop_angle):
+            entry = None
+    if entry is None:
+        path = __new__(Path2D())
+        rx, ry = _ellipse_radius(width, height)
+        if shape == 1:
+            path.ellipse(int(width/2), int(height/2), rx, ry,
+                         0, 0, 2*_pi, False)
+        else:
+            path.ellipse(int(width/2), int(height/2), rx, ry,
+                         0, -start_angle, -stop_angle, True)
+            if shape == 3:
+                path.closePath()
+        entry = [path, 0, 0, width, height,
+                 [shape, width, height, start_angle, stop_angle]]
+        _path_cache.set(key, entry)
+    return entry[0]
+
+
+def _ellipse_radius(width, height):
+    """
+    Return ellipse radii matching the scaled circle of uncached drawing.
+    """
+    if width >= height:
+        radius = int(height/2)
+        if not height:
+            return (0, 0)
+        return (radius * width / height, radius)
+    else:
+        radius = int(width/2)
+        if not width:
+            return (0, 0)
+        return (radius, radius * height / width)
+
+
+def _draw_path(surface, color, path, x, y, width):
+    """
+    Draw cached path translated to position.
+    """
+    surface.saveContext()
+    surface.translate(x, y)
+    if width:
+        surface.setLineWidth(width)
+        surface.setStrokeStyle(_intern(color)._css)
+        surface.strokePath(path)
+    else:
+        surface.setFillStyle(_intern(color)._css)
+        surface.fillPath(path)
+    surface.restoreContext()
+
+
+def set_path_cache(setting, size=256):
+    """
+    Path cache.
+
+    Set whether ellipse, arc and polygon are drawn from cached Path2D,
+    keyed by shape size or points relative to first point, and
+    translated to position.
+    Cached ellipse and arc outlines are stroked with uniform width,
+    rather than the width scaled with the shape of uncached drawing.
+    Optional size of cache, the least recently used paths discarded
+    beyond size.
+    Setting (bool) defaults to False on module initialization.
+    """
+    global _path_cache
+    if setting:
+        if _path_cache is None:
+            _path_cache = LRUCache(size)
+        else:
+            _path_cache.budget = size
+            _path_cache.evict()
+    else:
+        _path_cache = None
+
+
 def bounding_rect_return(setting):
     """
     Bounding rect return.
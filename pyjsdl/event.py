@@ -24,15 +24,19 @@ class Event:
         Maintain events received from browser.
         Module initialization creates pyjsdl.event instance.
         """
-        self.eventQueue = [None for i in range(256)]
-        self.eventNum = 0
-        self.eventQueueTmp = [None for i in range(256)]
-        self.eventNumTmp = 0
-        self.queueLock = False
-        self.queueAccess = False
-        self.queue = []
+        self._queue = _EventQueue(256, 'drop_oldest')
         self.queueNil = []
-        self.queueTmp = []
+        self._coalesceMotion = False
+        self._coalesceTouch = False
+        self._touchMoves = __new__(Map())
+        self._touchOrigin = __new__(Map())
+        self._touchPos = __new__(Map())
+        self._pooling = False
+        self._pooled = []
+        self._eventObjSaved = {}
+        self._recycleHook = None
+        self._log = None
+        self._inputBlocked = False
         self.mouseEvt = {'pos':None, 'pre':None, 'rel':None, 'focus':False}
         self.mousePress = {0:False, 1:False, 2:False}
         self.keyPress = {Const.K_ALT: False,
@@ -129,93 +133,94 @@ class Event:
         self.Event = UserEvent
         self._nonimplemented_methods()
 
-    def _lock(self):
-        self.queueLock = True
-
-    def _unlock(self):
-        self.queueLock = False
-
     def _updateQueue(self, event):
-        self.queueAccess = True
-        if not self.queueLock:
-            if self.eventNumTmp:
-                 self._appendMerge()
-            self._append(event)
-        else:
-            self._appendTmp(event)
-        self.queueAccess = False
-
-    def _append(self, event):
-        if self.eventNum < 255:
-            self.eventQueue[self.eventNum] = event
-            self.eventNum += 1
-
-    def _appendTmp(self, event):
-        if self.eventNumTmp < 255:
-            self.eventQueueTmp[self.eventNumTmp] = event
-            self.eventNumTmp += 1
-
-    def _appendMerge(self):
-        for i in range(self.eventNumTmp):
-            self._append( self.eventQueueTmp[i] )
-            self.eventQueueTmp[i] = None
-        self.eventNumTmp = 0
+        if self._inputBlocked:
+            return
+        if self._coalesceMotion and event.type == Const.MOUSEMOTION:
+            last = self._queue.last()
+            if (isinstance(last, MouseMoveEvent) and
+                    last.event.buttons == event.event.buttons):
+                if last._pooled and event._pooled:
+                    last._merge(event)
+                    _release_event(event)
+                    return
+                last.pos = event.pos
+                last.rel = (last.rel[0] + event.rel[0],
+                            last.rel[1] + event.rel[1])
+                last.event = event.event
+                return
+        self._queue.push(event)
+
+    def _touchTrack(self, event):
+        touches = event.changedTouches
+        for i in range(touches.length):
+            touch = touches.item(i)
+            if event.js_type == 'touchstart':
+                self._touchPos.set(touch.identifier,
+                                   [touch.clientX, touch.clientY])
+            else:
+                self._touchPos.delete(touch.identifier)
+
+    def _touchMove(self, event):
+        touches = event.changedTouches
+        for i in range(touches.length):
+            touch = touches.item(i)
+            identifier = touch.identifier
+            pos = [touch.clientX, touch.clientY]
+            if not self._touchMoves.has(identifier):
+                if self._touchPos.has(identifier):
+                    origin = self._touchPos.js_get(identifier)
+                else:
+                    origin = pos
+                self._touchOrigin.set(identifier, origin)
+            self._touchPos.set(identifier, pos)
+            self._touchMoves.delete(identifier)
+            self._touchMoves.set(identifier, event)
+
+    def _touchFlush(self):
+        moves = []
+        self._touchMoves.forEach(lambda val, key: moves.append([key, val]))
+        self._touchMoves.js_clear()
+        events = []
+        for identifier, event in moves:
+            if event not in events:
+                event.rel = {}
+                events.append(event)
+            origin = self._touchOrigin.js_get(identifier)
+            pos = self._touchPos.js_get(identifier)
+            event.rel[identifier] = (pos[0] - origin[0], pos[1] - origin[1])
+        self._touchOrigin.js_clear()
+        return events
 
     def pump(self):
         """
         Process event queue.
 
-        Process events to reduce queue overflow, unnecessary if processing with other methods.
+        Queue overflow is processed by the overflow policy, see set_overflow.
         """
-        if self.eventNum > 250:
-            self._lock()
-            self._pump()
-            self._unlock()
         return None
 
-    def _pump(self):
-        queue = self.eventQueue[50:self.eventNum]
-        self.eventNum -= 50
-        for i in range(self.eventNum):
-            self.eventQueue[i] = queue[i]
-
     def get(self, eventType=None):
         """
         Return list of events, and queue is reset.
 
         Optional eventType argument of single or list of event type(s) to return.
         """
-        if not self.eventNum:
+        if not self._queue.size:
             return self.queueNil
-        self._lock()
         if not eventType:
-            self.queue = self.eventQueue[0:self.eventNum]
-            self.eventNum = 0
+            events = self._queue.take_all()
+        elif isinstance(eventType, (tuple,list)):
+            events = self._queue.take(eventType)
         else:
-            self.queue = []
-            if isinstance(eventType, (tuple,list)):
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type not in eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-                    else:
-                        self.queue.append(self.eventQueue[i])
-            else:
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type != eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-                    else:
-                        self.queue.append(self.eventQueue[i])
-            if len(self.queueTmp) == 0:
-                self.eventNum = 0
-            else:
-                self.eventNum = len(self.queueTmp)
-                for i in range(self.eventNum):
-                    self.eventQueue[i] = self.queueTmp[i]
-                self.queueTmp[:] = []
-            if self.eventNum > 250:
-                self._pump()
-        self._unlock()
-        return self.queue
+            events = self._queue.take([eventType])
+        if self._log is not None:
+            self._log.deliver(events)
+        if self._pooling:
+            for evt in events:
+                if evt._pooled:
+                    self._pooled.append(evt)
+        return events
 
     def poll(self):
         """
@@ -223,16 +228,13 @@ class Event:
 
         Return event type NOEVENT if none present.
         """
-        self._lock()
-        if self.eventNum:
-            evt = self.eventQueue.pop(0)
-            self.eventNum -= 1
-            self.eventQueue.append(None)
-            if self.eventNum > 250:
-                self._pump()
-        else:
-            evt = self.Event(Const.NOEVENT)
-        self._unlock()
+        evt = self._queue.pop()
+        if evt is None:
+            return self.Event(Const.NOEVENT)
+        if self._log is not None:
+            self._log.deliver([evt])
+        if self._pooling and evt._pooled:
+            self._pooled.append(evt)
         return evt
 
     def wait(self):     #not implemented in js
@@ -242,19 +244,14 @@ class Event:
         Return None if queue is empty.
         Waiting not implemented.
         """
-        while True:
-            if self.eventNum:
-                self._lock()
-                evt = self.eventQueue.pop(0)
-                self.eventNum -= 1
-                self.eventQueue.append(None)
-                if self.eventNum > 250:
-                    self._pump()
-                self._unlock()
-                return evt
-            else:
-                self._unlock()
-                return None
+        evt = self._queue.pop()
+        if evt is None:
+            return None
+        if self._log is not None:
+            self._log.deliver([evt])
+        if self._pooling and evt._pooled:
+            self._pooled.append(evt)
+        return evt
 
     def peek(self, eventType=None):
         """
@@ -262,23 +259,14 @@ class Event:
 
         Optional eventType argument specifies event type or list, which defaults to all.
         """
-        if not self.eventNum:
+        if not self._queue.size:
             return False
         elif eventType is None:
             return True
-        self._lock()
-        evt = [event.type for event in self.eventQueue[0:self.eventNum]]
-        if self.eventNum > 250:
-            self._pump()
-        self._unlock()
         if isinstance(eventType, (tuple,list)):
-            for evtType in eventType:
-                if evtType in evt:
-                    return True
+            return self._queue.peek(eventType)
         else:
-            if eventType in evt:
-                return True
-        return False
+            return self._queue.peek([eventType])
 
     def clear(self, eventType=None):
         """
@@ -286,32 +274,131 @@ class Event:
 
         Optional eventType argument specifies event type or list, which defaults to all.
         """
-        if not self.eventNum:
+        if not self._queue.size:
             return None
-        self._lock()
         if eventType is None:
-            self.eventNum = 0
+            self._queue.clear()
+        elif isinstance(eventType, (tuple,list)):
+            self._queue.take(eventType)
         else:
-            if isinstance(eventType, (tuple,list)):
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type not in eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-            else:
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type != eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-            if len(self.queueTmp) == 0:
-                self.eventNum = 0
-            else:
-                self.eventNum = len(self.queueTmp)
-                for i in range(self.eventNum):
-                    self.eventQueue[i] = self.queueTmp[i]
-                self.queueTmp[:] = []
-            if self.eventNum > 250:
-                self._pump()
-        self._unlock()
+            self._queue.take([eventType])
+        return None
+
+    def set_overflow(self, policy, capacity=None):
+        """
+        Set event queue overflow policy.
+
+        Argument policy when queue is full is 'drop_oldest' to discard the oldest event, 'drop_newest' to discard the new event, or 'grow' to double queue capacity.
+        Optional capacity argument to resize queue, which is 256 on module initialization.
+        """
+        if policy not in ('drop_oldest', 'drop_newest', 'grow'):
+            raise ValueError('unknown overflow policy {}'.format(policy))
+        self._queue.policy = policy
+        if capacity is not None:
+            self._queue.resize(capacity)
+        return None
+
+    def get_overflow(self):
+        """
+        Return event queue overflow policy and capacity.
+        """
+        return (self._queue.policy, self._queue.capacity)
+
+    def set_coalesce(self, eventType, setting=True):
+        """
+        Set event coalescing of motion event type.
+
+        Argument eventType is MOUSEMOTION to merge consecutive motion events with same buttons into the last, accumulating rel, or 'touchmove' to deliver touch move events to touch callbacks once per frame for each touch, with event.rel a dict of touch identifier to position change (x,y) accumulated over the frame.
+        Optional setting argument, default to True.
+        """
+        if eventType in (Const.MOUSEMOTION, 'mousemove'):
+            self._coalesceMotion = setting
+        elif eventType == 'touchmove':
+            self._coalesceTouch = setting
+        else:
+            raise ValueError('event type {} not coalesced'.format(eventType))
+        return None
+
+    def get_coalesce(self, eventType):
+        """
+        Check if event coalescing of motion event type is set.
+        """
+        if eventType in (Const.MOUSEMOTION, 'mousemove'):
+            return self._coalesceMotion
+        elif eventType == 'touchmove':
+            return self._coalesceTouch
+        return False
+
+    def set_pooling(self, setting=True):
+        """
+        Set pooling of browser event objects.
+
+        With pooling, mouse button, mouse motion and key events are recycled from a pool, and their attributes are decoded from the JavaScript event when accessed.
+        Events returned by get, poll or wait are recycled at the start of the next frame, so code keeping events beyond the frame should copy the attributes needed or not set pooling.
+        Optional setting argument, default to True.
+        """
+        if setting == self._pooling:
+            return None
+        pooled = {'mousedown': _PooledMouseButtonEvent,
+                  'mouseup': _PooledMouseButtonEvent,
+                  'mousemove': _PooledMouseMoveEvent,
+                  'keydown': _PooledKeyEvent,
+                  'keyup': _PooledKeyEvent}
+        if setting:
+            keydown = self.eventObj['keydown']
+            for eventType in pooled.keys():
+                if (eventType in ('keydown', 'keyup') and
+                        keydown is not KeyDownEvent):
+                    continue
+                acquire = self._acquire_function(pooled[eventType])
+                self._eventObjSaved[eventType] = [self.eventObj[eventType],
+                                                  acquire]
+                self.eventObj[eventType] = acquire
+            self._recycleHook = self._recycle
+            if env.canvas is not None:
+                env.canvas._frame_hooks.append(self._recycleHook)
+        else:
+            if (env.canvas is not None and
+                    self._recycleHook in env.canvas._frame_hooks):
+                env.canvas._frame_hooks.remove(self._recycleHook)
+            self._recycleHook = None
+            self._recycle()
+            for eventType in self._eventObjSaved.keys():
+                previous, acquire = self._eventObjSaved[eventType]
+                if self.eventObj[eventType] is acquire:
+                    self.eventObj[eventType] = previous
+            self._eventObjSaved = {}
+        self._pooling = setting
         return None
 
+    def get_pooling(self):
+        """
+        Check if pooling of browser event objects is set.
+        """
+        return self._pooling
+
+    def _acquire_function(self, cls):
+        def acquire(event):
+            if len(cls._pool):
+                evt = cls._pool.pop()
+                evt._init(event)
+            else:
+                evt = cls(event)
+            return evt
+        return acquire
+
+    def _recycle(self):
+        if len(self._pooled):
+            for evt in self._pooled:
+                _release_event(evt)
+            self._pooled = []
+
+    def get_dropped(self):
+        """
+        Return count of events dropped by queue overflow.
+        """
+        return self._queue.dropped
+
     def event_name(self, eventType):
         """
         Return event name of a event type.
@@ -370,10 +457,8 @@ class Event:
         """
         Post event to queue.
         """
-        self._lock()
         if event.type in self.events:
-            self._append(event)
-        self._unlock()
+            self._queue.push(event)
         return None
 
     def _set_mouse_event(self, canvas):
@@ -409,6 +494,7 @@ class UserEvent:
     """
 
     __slots__ = ['type', 'attr']
+    _pooled = False
 
     # __pragma__ ('kwargs')
 
@@ -467,6 +553,8 @@ class JEvent:
     """
 
     __slots__ = []
+    _attrs = None
+    _pooled = False
 
     def __str__(self):
         return self.toString()
@@ -477,7 +565,8 @@ class JEvent:
     def toString(self):
         event_name = self._eventName[self.type]
         attr = {}
-        for name in self.__slots__[1:len(self.__slots__)]:
+        names = self.__slots__ if self._attrs is None else self._attrs
+        for name in names[1:len(names)]:
             attr[name] = getattr(self, name)
         return '<Event({}-{} {})>'.format(self.type, event_name, repr(attr))
 
@@ -1019,6 +1108,290 @@ class PageHide(JEvent):
         self.type = Const.QUIT
 
 
+class _PooledMouseButtonEvent(MouseEvent):
+    """
+    Pooled MouseButtonEvent object.
+
+    JEvent wrapper with MOUSEBUTTONDOWN and MOUSEBUTTONUP event interface,
+    with attributes decoded when accessed.
+    """
+
+    __slots__ = ['type', 'event', '_rect', '_pos']
+    _attrs = ['type', 'button', 'pos', 'event']
+    _pool = []
+    _pooled = True
+
+    def __init__(self, event):
+        self._init(event)
+
+    def _init(self, event):
+        self.event = event
+        self.type = self._types[event.js_type]
+        self._rect = env.canvas._clientRect
+        self._pos = None
+
+    @property
+    def button(self):
+        return self.event.button + 1
+
+    @property
+    def pos(self):
+        if self._pos is None:
+            self._pos = (self.event.clientX - self._rect.left,
+                         self.event.clientY - self._rect.top)
+        return self._pos
+
+
+class _PooledMouseMoveEvent(MouseMoveEvent):
+    """
+    Pooled MouseMoveEvent object.
+
+    JEvent wrapper with MOUSEMOTION event interface, with attributes
+    decoded when accessed, and rel from the previous position at creation.
+    """
+
+    __slots__ = ['type', 'event', '_rect', '_relx', '_rely',
+                 '_buttons', '_pos', '_rel']
+    _attrs = ['type', 'buttons', 'pos', 'rel', 'event']
+    _pool = []
+    _pooled = True
+
+    def __init__(self, event):
+        self._init(event)
+
+    def _init(self, event):
+        self.event = event
+        self.type = Const.MOUSEMOTION
+        self._rect = env.canvas._clientRect
+        previous = env.event.mouseEvt['pre']
+        self._relx = event.clientX - previous.clientX
+        self._rely = event.clientY - previous.clientY
+        self._buttons = None
+        self._pos = None
+        self._rel = None
+
+    def _merge(self, evt):
+        self.event = evt.event
+        self._rect = evt._rect
+        self._relx += evt._relx
+        self._rely += evt._rely
+        self._pos = None
+        self._rel = None
+
+    @property
+    def buttons(self):
+        if self._buttons is None:
+            self._buttons = (bool(self.event.buttons & 1),
+                             bool(self.event.buttons & 4),
+                             bool(self.event.buttons & 2))
+        return self._buttons
+
+    @property
+    def pos(self):
+        if self._pos is None:
+            self._pos = (self.event.clientX - self._rect.left,
+                         self.event.clientY - self._rect.top)
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos):
+        self._pos = pos
+
+    @property
+    def rel(self):
+        if self._rel is None:
+            self._rel = (self._relx, self._rely)
+        return self._rel
+
+    @rel.setter
+    def rel(self, rel):
+        self._relx = rel[0]
+        self._rely = rel[1]
+        self._rel = rel
+
+
+class _PooledKeyEvent(KeyEvent):
+    """
+    Pooled KeyEvent object.
+
+    JEvent wrapper with KEYDOWN and KEYUP event interface, with attributes
+    decoded when accessed.
+    """
+
+    __slots__ = ['type', 'event']
+    _attrs = ['type', 'key', 'mod', 'unicode', 'event']
+    _pool = []
+    _pooled = True
+
+    def __init__(self, event):
+        self._init(event)
+
+    def _init(self, event):
+        self.event = event
+        self.type = self._types[event.js_type]
+
+    @property
+    def key(self):
+        event = self.event
+        if event.key in self._specialKey:
+            return self._specialKey[event.key]
+        elif event.code in self._code:
+            return self._code[event.code]
+        else:
+            return event.code
+
+    @property
+    def unicode(self):
+        event = self.event
+        if event.key in self._specialKey:
+            if self._specialKey[event.key] in (9, 13):
+                return chr(self._specialKey[event.key])
+            else:
+                return ''
+        else:
+            return event.key
+
+    @property
+    def mod(self):
+        event = self.event
+        return ( (event.altKey * Const.KMOD_ALT) |
+                 (event.ctrlKey * Const.KMOD_CTRL) |
+                 (event.shiftKey * Const.KMOD_SHIFT) )
+
+
+def _release_event(evt):
+    evt.event = None
+    if len(evt._pool) < 64:
+        evt._pool.append(evt)
+
+
+class _EventQueue:
+    """
+    Event queue.
+
+    Circular buffer of events in slots by sequence number, with removed
+    events left as None, and index Map of event type to list of sequence
+    numbers in order, which are stale if before head.
+    """
+
+    def __init__(self, capacity, policy):
+        self.capacity = capacity
+        self.policy = policy
+        self.slots = [None for i in range(capacity)]
+        self.head = 0
+        self.tail = 0
+        self.size = 0
+        self.dropped = 0
+        self.index = __new__(Map())
+
+    def push(self, event):
+        if self.tail - self.head >= self.capacity:
+            if self.size < self.capacity:
+                self._repack(self.capacity)
+            elif self.policy == 'drop_oldest':
+                self.pop()
+                self.dropped += 1
+            elif self.policy == 'grow':
+                self._repack(self.capacity * 2)
+            else:
+                self.dropped += 1
+                return False
+        seq = self.tail
+        self.slots[seq % self.capacity] = event
+        self.tail += 1
+        self.size += 1
+        if self.index.has(event.type):
+            bucket = self.index.js_get(event.type)
+            if len(bucket) > 16 and bucket[len(bucket)//2] < self.head:
+                i = 0
+                while bucket[i] < self.head:
+                    i += 1
+                bucket.splice(0, i)
+            bucket.append(seq)
+        else:
+            self.index.set(event.type, [seq])
+        return True
+
+    def pop(self):
+        self._advance()
+        if self.head == self.tail:
+            return None
+        i = self.head % self.capacity
+        event = self.slots[i]
+        self.slots[i] = None
+        self.head += 1
+        self.size -= 1
+        return event
+
+    def last(self):
+        if self.head == self.tail:
+            return None
+        return self.slots[(self.tail-1) % self.capacity]
+
+    def take(self, types):
+        seqs = []
+        for eventType in types:
+            if self.index.has(eventType):
+                for seq in self.index.js_get(eventType):
+                    if seq >= self.head:
+                        seqs.append(seq)
+                self.index.delete(eventType)
+        if len(types) > 1:
+            seqs.sort()
+        events = []
+        for seq in seqs:
+            i = seq % self.capacity
+            events.append(self.slots[i])
+            self.slots[i] = None
+        self.size -= len(seqs)
+        self._advance()
+        return events
+
+    def take_all(self):
+        events = []
+        for seq in range(self.head, self.tail):
+            event = self.slots[seq % self.capacity]
+            if event is not None:
+                events.append(event)
+        self.clear()
+        return events
+
+    def peek(self, types):
+        for eventType in types:
+            if self.index.has(eventType):
+                bucket = self.index.js_get(eventType)
+                if len(bucket) and bucket[len(bucket)-1] >= self.head:
+                    return True
+        return False
+
+    def clear(self):
+        for seq in range(self.head, self.tail):
+            self.slots[seq % self.capacity] = None
+        self.head = self.tail
+        self.size = 0
+        self.index.js_clear()
+
+    def resize(self, capacity):
+        while self.size > capacity:
+            self.pop()
+            self.dropped += 1
+        self._repack(capacity)
+
+    def _advance(self):
+        while (self.head < self.tail and
+               self.slots[self.head % self.capacity] is None):
+            self.head += 1
+
+    def _repack(self, capacity):
+        events = self.take_all()
+        self.capacity = capacity
+        self.slots = [None for i in range(capacity)]
+        self.head = 0
+        self.tail = 0
+        for event in events:
+            self.push(event)
+
+
 class _Evt:
 
     def __init__(self, canvas):
@@ -9,8 +9,10 @@ The module provides font access and rendering on a surface.
 
 from math import ceil as _ceil
 from pyjsdl.surface import Surface
-from pyjsdl.color import Color
+from pyjsdl.rect import Rect
+from pyjsdl.color import _intern
 from pyjsdl.pyjsobj import HTML5Canvas
+from pyjsdl.util import LRUCache
 from pyjsdl import constants as Const
 
 
@@ -89,6 +91,58 @@ def match_font(name):
     return font
 
 
+# __pragma__ ('kwargs')
+
+def set_cache(enable=True, budget=None, size_entries=None):
+    """
+    Set font cache.
+
+    Argument enable for Font.render to return surfaces from cache, keyed by
+    font, style, text, color, background and antialias.
+    Optional budget of cached surfaces in bytes (default 8MB), and
+    size_entries of cached Font.size measurements (default 1024), beyond
+    which least recently used are discarded.
+    Cached surfaces are shared, and are regenerated if drawn on.
+    """
+    _render_cache.enabled = enable
+    if budget is not None:
+        _render_cache.budget = budget
+        _render_cache.evict()
+    if size_entries is not None:
+        _size_cache.budget = size_entries
+        _size_cache.evict()
+    return None
+
+# __pragma__ ('nokwargs')
+
+
+def get_cache_stats():
+    """
+    Return font cache statistics.
+
+    Return dict with render and size dicts of hits, misses, hit_rate,
+    bytes or entries of cache.
+    """
+    return {'render': {'hits': _render_cache.hits,
+                       'misses': _render_cache.misses,
+                       'hit_rate': _render_cache.hit_rate(),
+                       'bytes': _render_cache.size,
+                       'entries': _render_cache.entries.size},
+            'size': {'hits': _size_cache.hits,
+                     'misses': _size_cache.misses,
+                     'hit_rate': _size_cache.hit_rate(),
+                     'entries': _size_cache.entries.size}}
+
+
+def clear_cache():
+    """
+    Clear font cache and statistics.
+    """
+    _render_cache.clear()
+    _size_cache.clear()
+    return None
+
+
 class Font:
     """
     Font object.
@@ -185,6 +239,7 @@ Example of font file declaration:
         self.fontstyle = self.bold + ' ' + self.italic
         self.underline = False
         self.char_size = None
+        self._custom_font = load_custom_font
         if load_custom_font:
             self.render('x')
         self._nonimplemented_methods()
@@ -204,6 +259,25 @@ Example of font file declaration:
 
         Arguments are text to render, and optional antialias, RGB color of text, RGB color of background, and surface for text rendering.
         """
+        if not surface and _render_cache.enabled and self._font_ready():
+            key = '{}|{}|{}|{}|{}|{}|{}|{}'.format(
+                self.fontstyle, self.fontsize, self.fontname,
+                self.underline, bool(antialias), _intern(color)._css,
+                _intern(background)._css if background else '', text)
+            surf = _render_cache.get(key)
+            if surf is not None:
+                surf._colorkey = None
+                surf._alpha = 1.0
+                return surf
+            surf = self._render(text, color, background, None)
+            _render_cache.set(key, surf, surf.width * surf.height * 4,
+                              surf._version)
+            return surf
+        return self._render(text, color, background, surface)
+
+    # __pragma__ ('nokwargs')
+
+    def _render(self, text, color, background, surface):
         if not surface:
             w,h = self.size(text)
             surf = Surface((w,h), Const.SRCALPHA)
@@ -211,31 +285,39 @@ Example of font file declaration:
             surf = surface
             w,h = surface.width, surface.height
         if background:
-            surf.setFillStyle(Color(background))
+            surf.setFillStyle(_intern(background)._css)
             surf.fillRect(0,0,w,h)
         surf.setFont('{} {}px {}'.format(self.fontstyle,
                                          self.fontsize,
                                          self.fontname))
-        surf.setFillStyle(Color(color))
+        surf.setFillStyle(_intern(color)._css)
         surf.setTextAlign('center')
         surf.setTextBaseline('middle')
         surf.fillText(text,w/2,h/2)
         if self.underline:
             surf.setLineWidth(self.fontsize/20)
-            surf.setStrokeStyle(Color(color))
+            surf.setStrokeStyle(_intern(color)._css)
             surf.beginPath()
             surf.moveTo(0, h*0.85)
             surf.lineTo(w, h*0.85)
             surf.stroke()
         return surf
 
-    # __pragma__ ('nokwargs')
-
     def size(self, text):
         """
         Return size (width, height) of rendered text.
         """
-        if _surf:
+        if _surf and self._font_ready():
+            key = '{}|{}|{}|{}'.format(self.fontstyle, self.fontsize,
+                                       self.fontname, text)
+            x = _size_cache.get(key)
+            if x is None:
+                _surf.setFont('{} {}px {}'.format(self.fontstyle,
+                                                  self.fontsize,
+                                                  self.fontname))
+                x = _surf.measureText(text)
+                _size_cache.set(key, x)
+        elif _surf:
             _surf.setFont('{} {}px {}'.format(self.fontstyle,
                                               self.fontsize,
                                               self.fontname))
@@ -247,6 +329,15 @@ Example of font file declaration:
         y = int(self.fontsize * 1.2)
         return (x, y)
 
+    def _font_ready(self):
+        if not self._custom_font:
+            return True
+        if document.fonts and document.fonts.check(
+                '{}px {}'.format(self.fontsize, self.fontname)):
+            self._custom_font = False
+            return True
+        return False
+
     def _size_estimate(self, text=None):
         if not self.char_size:
             self.char_size = self._get_char_size()
@@ -361,3 +452,189 @@ class SysFont(Font):
 
     # __pragma__ ('nokwargs')
 
+
+class GlyphAtlas:
+    """
+    GlyphAtlas object.
+    """
+
+    # __pragma__ ('kwargs')
+
+    def __init__(self, font, color=(0,0,0), chars=None):
+        """
+        Initialize GlyphAtlas object.
+
+        Glyphs of font in color rendered once into an atlas surface, with
+        glyphs dict of [x, y, width, advance] by character.
+        Optional chars to render, defaults to printable ascii, other
+        characters are added when requested.
+        """
+        self.font = font
+        self.color = _intern(color)._css
+        self.height = int(font.fontsize * 1.2)
+        self.pad = int(_ceil(font.fontsize * 0.2))
+        self.glyphs = {}
+        self.surface = Surface((512, self.height), Const.SRCALPHA)
+        self._x = 0
+        self._y = 0
+        if chars is None:
+            chars = _glyph_chars
+        self.add(chars)
+
+    # __pragma__ ('nokwargs')
+
+    def __str__(self):
+        s = '<{}({} glyphs)>'
+        return s.format(self.__class__.__name__, len(self.glyphs))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def add(self, chars):
+        """
+        Render characters into atlas.
+        """
+        for char in chars:
+            if char not in self.glyphs:
+                self._add_glyph(char)
+        return None
+
+    def get(self, char):
+        """
+        Return glyph [x, y, width, advance] of character.
+        """
+        if char not in self.glyphs:
+            self._add_glyph(char)
+        return self.glyphs[char]
+
+    def _add_glyph(self, char):
+        advance = self.font.size(char)[0]
+        if char == ' ':
+            self.glyphs[char] = [0, 0, 0, advance]
+            return self.glyphs[char]
+        width = int(_ceil(advance)) + 2*self.pad
+        if self._x + width > self.surface.width:
+            self._x = 0
+            self._y += self.height + 1
+        if self._y + self.height > self.surface.height:
+            self._grow(max(width, self.surface.width),
+                       self.surface.height*2 + 1)
+        surf = self.surface
+        surf.setFont('{} {}px {}'.format(self.font.fontstyle,
+                                         self.font.fontsize,
+                                         self.font.fontname))
+        surf.setFillStyle(self.color)
+        surf.setTextAlign('left')
+        surf.setTextBaseline('middle')
+        surf.fillText(char, self._x + self.pad, self._y + self.height/2)
+        self.glyphs[char] = [self._x, self._y, width, advance]
+        self._x += width + 1
+        return self.glyphs[char]
+
+    def _grow(self, width, height):
+        surf = Surface((width, height), Const.SRCALPHA)
+        surf.drawImage(self.surface.canvas, 0, 0)
+        self.surface = surf
+
+    def toString(self):
+        return self.__str__()
+
+
+class BitmapFont:
+    """
+    BitmapFont object.
+    """
+
+    # __pragma__ ('kwargs')
+
+    def __init__(self, font, color=(0,0,0), chars=None):
+        """
+        Initialize BitmapFont object.
+
+        Text drawn as blits of glyphs from a GlyphAtlas of font in color.
+        Optional chars to prerender, defaults to printable ascii.
+        """
+        self.atlas = GlyphAtlas(font, color, chars)
+
+    # __pragma__ ('nokwargs')
+
+    def __str__(self):
+        s = '<{}({})>'
+        return s.format(self.__class__.__name__, self.atlas.font.fontname)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def size(self, text):
+        """
+        Return size (width, height) of text.
+        """
+        width = 0
+        for char in text:
+            width += self.atlas.get(char)[3]
+        return (int(_ceil(width)), self.atlas.height)
+
+    def render(self, text):
+        """
+        Return Surface with text.
+        """
+        w, h = self.size(text)
+        surf = Surface((max(w, 1), h), Const.SRCALPHA)
+        self._draw(surf._ctx, text, 0, 0)
+        surf._version += 1
+        return surf
+
+    def render_to(self, surface, position, text):
+        """
+        Draw text on surface at position.
+
+        Return rect of text.
+        """
+        if not hasattr(position, '_x'):
+            x = position[0]
+            y = position[1]
+        else:
+            x = position.x
+            y = position.y
+        width = self._draw(surface._ctx, text, x, y) - x
+        surface._version += 1
+        return Rect(x, y, int(_ceil(width)), self.atlas.height)
+
+    def render_many(self, surface, text_sequence):
+        """
+        Draw sequence of (text, position) on surface.
+        """
+        ctx = surface._ctx
+        for text, position in text_sequence:
+            if not hasattr(position, '_x'):
+                self._draw(ctx, text, position[0], position[1])
+            else:
+                self._draw(ctx, text, position.x, position.y)
+        surface._version += 1
+        return None
+
+    def _draw(self, ctx, text, x, y):
+        atlas = self.atlas
+        glyphs = atlas.glyphs
+        height = atlas.height
+        pad = atlas.pad
+        for char in text:
+            if char not in glyphs:
+                atlas._add_glyph(char)
+            glyph = glyphs[char]
+            if glyph[2]:
+                ctx.drawImage(atlas.surface.canvas,
+                              glyph[0], glyph[1], glyph[2], height,
+                              x - pad, y, glyph[2], height)
+            x += glyph[3]
+        return x
+
+    def toString(self):
+        return self.__str__()
+
+
+_glyph_chars = ''.join([chr(i) for i in range(32, 127)])
+
+
+_render_cache = LRUCache(8*1024*1024, False)
+_size_cache = LRUCache(1024)
@@ -9,6 +9,7 @@ The module provides function to load images and convert them to surface objects.
 
 from pyjsdl.pylib import os
 from pyjsdl.surface import Surface, Surf
+from pyjsdl.rect import Rect
 from pyjsdl.pyjsobj import loadImages
 from pyjsdl import constants as Const
 from pyjsdl import env
@@ -61,6 +62,59 @@ class Image:
         surface.drawImage(image, 0, 0)
         return surface
 
+    def build_atlas(self, names, max_size=2048, padding=1):
+        """
+        Pack preloaded images into atlas surfaces.
+
+        Argument names is a list of preloaded images, with optional max_size
+        of atlas surface side and padding between images.
+        Images are packed with a skyline packer into one or more surfaces.
+        Return Atlas with AtlasImage of each image, drawn by Surface.blit
+        area of an atlas surface.
+        """
+        images = [(name, self.get_image(name)) for name in names]
+        images.sort(key=lambda item: item[1].height*(max_size+1) +
+                                     item[1].width,
+                    reverse=True)
+        packers = []
+        placement = []
+        for name, image in images:
+            width = image.width + padding
+            height = image.height + padding
+            pos = None
+            for index, packer in enumerate(packers):
+                pos = packer.insert(width, height)
+                if pos is not None:
+                    break
+            if pos is None:
+                packer = _Skyline(max(max_size, width), max(max_size, height))
+                packers.append(packer)
+                index = len(packers) - 1
+                pos = packer.insert(width, height)
+            placement.append((name, image, index, pos[0], pos[1]))
+        sizes = [[0,0] for packer in packers]
+        for name, image, index, x, y in placement:
+            size = sizes[index]
+            size[0] = max(size[0], x + image.width)
+            size[1] = max(size[1], y + image.height)
+        surfaces = [Surface((size[0],size[1]), Const.SRCALPHA)
+                    for size in sizes]
+        atlas_images = {}
+        image_area = 0
+        for name, image, index, x, y in placement:
+            surfaces[index].drawImage(image, x, y)
+            atlas_images[os.path.normpath(name)] = AtlasImage(
+                surfaces[index], Rect(x, y, image.width, image.height))
+            image_area += image.width * image.height
+        surface_area = 0
+        for size in sizes:
+            surface_area += size[0] * size[1]
+        if surface_area:
+            efficiency = image_area / surface_area
+        else:
+            efficiency = 0.0
+        return Atlas(surfaces, atlas_images, efficiency)
+
     def preload_images(self, images, callback=None):
         """
         Preload images list.
@@ -111,3 +165,164 @@ class ImageLoader:
         if self.callback:
             self.callback()
 
+
+class Atlas:
+    """
+    Atlas object.
+    """
+
+    def __init__(self, surfaces, images, efficiency):
+        """
+        Initialize Atlas object.
+
+        Atlas returned by image.build_atlas with atlas surfaces, images
+        dict of AtlasImage by name, and packing efficiency as fraction of
+        atlas surface area used by images.
+        """
+        self.surfaces = surfaces
+        self.images = images
+        self.efficiency = efficiency
+
+    def __str__(self):
+        s = '<{}({} images in {} surfaces)>'
+        return s.format(self.__class__.__name__,
+                        len(self.images), len(self.surfaces))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get(self, name):
+        """
+        Return AtlasImage of image name.
+        """
+        name = os.path.normpath(name)
+        if name not in self.images:
+            raise pyjsdl.error('Image {} not in atlas'.format(name))
+        return self.images[name]
+
+    def get_efficiency(self):
+        """
+        Return fraction of atlas surface area used by images.
+        """
+        return self.efficiency
+
+    def toString(self):
+        return self.__str__()
+
+
+class AtlasImage:
+    """
+    AtlasImage object.
+    """
+
+    def __init__(self, surface, area):
+        """
+        Initialize AtlasImage object.
+
+        Image in atlas surface at area, drawn with Surface.blit area
+        as surface.blit(image.surface, position, image.area).
+        """
+        self.surface = surface
+        self.area = area
+        self.width = area.width
+        self.height = area.height
+
+    def __str__(self):
+        s = '<{}({}x{})>'
+        return s.format(self.__class__.__name__, self.width, self.height)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_size(self):
+        """
+        Return width and height of image.
+        """
+        return (self.width, self.height)
+
+    def get_rect(self):
+        """
+        Return rect of the image.
+        """
+        return Rect(0, 0, self.width, self.height)
+
+    def draw(self, surface, position):
+        """
+        Draw image on surface at position.
+        """
+        return surface.blit(self.surface, position, self.area)
+
+    def toString(self):
+        return self.__str__()
+
+
+class _Skyline:
+    """
+    Skyline rectangle packer.
+
+    The skyline is a list of [x, y, width] segments of the packed top edge,
+    and a rectangle is placed at the position with lowest top.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.skyline = [[0, 0, width]]
+
+    def insert(self, width, height):
+        """
+        Return position (x, y) of rectangle placed, or None if no fit.
+        """
+        skyline = self.skyline
+        best_index = -1
+        best_top = self.height + 1
+        best_x = 0
+        best_y = 0
+        for i in range(len(skyline)):
+            y = self._fit(i, width, height)
+            if y >= 0 and y + height < best_top:
+                best_index = i
+                best_top = y + height
+                best_x = skyline[i][0]
+                best_y = y
+        if best_index == -1:
+            return None
+        skyline.insert(best_index, [best_x, best_top, width])
+        i = best_index + 1
+        end = best_x + width
+        while i < len(skyline):
+            segment = skyline[i]
+            if segment[0] >= end:
+                break
+            shrink = end - segment[0]
+            if segment[2] <= shrink:
+                skyline.pop(i)
+            else:
+                segment[0] += shrink
+                segment[2] -= shrink
+                break
+        i = 0
+        while i < len(skyline) - 1:
+            if skyline[i][1] == skyline[i+1][1]:
+                skyline[i][2] += skyline[i+1][2]
+                skyline.pop(i+1)
+            else:
+                i += 1
+        return (best_x, best_y)
+
+    def _fit(self, index, width, height):
+        skyline = self.skyline
+        x = skyline[index][0]
+        if x + width > self.width:
+            return -1
+        y = 0
+        remaining = width
+        while remaining > 0:
+            segment = skyline[index]
+            if segment[1] > y:
+                y = segment[1]
+            if y + height > self.height:
+                return -1
+            remaining -= segment[2]
+            index += 1
+        return y
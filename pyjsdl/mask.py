@@ -7,7 +7,7 @@
 The module provides surface mask functionality.
 """
 
-from pyjsdl.pyjsarray import BitSet
+from pyjsdl.pyjsarray import BitSet32, Uint8Array, Uint32Array
 from pyjsdl.color import Color
 from pyjsdl.pylib import int
 
@@ -20,22 +20,41 @@ def from_surface(surface, threshold=127):
     Optional argument to set alpha threshold.
     """
     mask = Mask((surface.width, surface.height))
-    if not mask.bit:
+    if not mask._data.length:
         return None
-    imagedata = surface.getImageData(0, 0, surface.width, surface.height)
-    data = imagedata.data
-    width, height = surface.width*4, surface.height
-    for y in range(0, height):
-        xpix = 0
-        i = (y*width)+3
-        bitset = mask.bit[y]
-        bit = bitset._bit
-        _data = bitset._data
-        for x in range(0, width, 4):
-            if data[i+x] > threshold:
-                index = ~(~(xpix/bit))
-                _data[index] = _data[index] | bitset._bitmask[xpix%bit]
-            xpix += 1
+    pixels = _get_pixels(surface)
+    ashift = _channel_shift()[3]
+    width, height = mask.width, mask.height
+    stride = mask._stride
+    data = mask._data
+    for y in range(height):
+        row = y*stride
+        i = y*width
+        for k in range(stride):
+            n = min(32, width - (k << 5))
+            word = 0
+            for x in range(i, i+n):
+                word = word << 1
+                if ((pixels[x] >> ashift) & 0xff) > threshold:
+                    word = word | 1
+            if n < 32:
+                word = word << (32-n)
+            data[row+k] = word
+            i += n
+    return mask
+
+
+def _surface_mask(surface):
+    """
+    Return mask from surface alpha, cached with the surface.
+
+    The cached mask is regenerated when surface is drawn to.
+    """
+    cache = surface._mask_cache
+    if cache is not None and cache[0] == surface._version:
+        return cache[1]
+    mask = from_surface(surface)
+    surface._mask_cache = (surface._version, mask)
     return mask
 
 
@@ -47,57 +66,68 @@ def from_threshold(surface, color, threshold=(0,0,0,255)):
     Optional threshold argument to set color range and alpha threshold.
     """
     mask = Mask((surface.width, surface.height))
-    if not mask.bit:
+    if not mask._data.length:
         return None
-    imagedata = surface.getImageData(0, 0, surface.width, surface.height)
-    data = imagedata.data
-    if threshold == (0,0,0,255):
-        color = Color(color)
-        width, height = surface.width*4, surface.height
-        for y in range(0, height):
-            xpix = 0
-            i = y*width
-            bitset = mask.bit[y]
-            bit = bitset._bit
-            _data = bitset._data
-            for x in range(0, width, 4):
-                ix = i+x
-                if (data[ix] == color.r and
-                    data[ix+1] == color.g and
-                    data[ix+2] == color.b and
-                    data[ix+3] >= threshold[3]):
-                    index = ~(~(xpix/bit))
-                    _data[index] = _data[index] | bitset._bitmask[xpix%bit]
-                xpix += 1
-    else:
-        color = Color(color)
-        col = {}
-        col['r1'] = color.r - threshold[0] - 1
-        col['r2'] = color.r + threshold[0] + 1
-        col['g1'] = color.g - threshold[1] - 1
-        col['g2'] = color.g + threshold[1] + 1
-        col['b1'] = color.b - threshold[2] - 1
-        col['b2'] = color.b + threshold[2] + 1
-        col['a'] = threshold[3] - 1
-        width, height = surface.width*4, surface.height
-        for y in range(0, height):
-            xpix = 0
-            i = y*width
-            bitset = mask.bit[y]
-            bit = bitset._bit
-            _data = bitset._data
-            for x in range(0, width, 4):
-                ix = i+x
-                if ((col['r1'] < data[ix] < col['r2']) and
-                    (col['g1'] < data[ix+1] < col['g2']) and
-                    (col['b1'] < data[ix+2] < col['b2']) and
-                    (data[ix+3] > col['a'])):
-                    index = ~(~(xpix/bit))
-                    _data[index] = _data[index] | bitset._bitmask[xpix%bit]
-                xpix += 1
+    pixels = _get_pixels(surface)
+    rshift, gshift, bshift, ashift = _channel_shift()
+    color = Color(color)
+    r1 = color.r - threshold[0]
+    r2 = color.r + threshold[0]
+    g1 = color.g - threshold[1]
+    g2 = color.g + threshold[1]
+    b1 = color.b - threshold[2]
+    b2 = color.b + threshold[2]
+    alpha = threshold[3]
+    width, height = mask.width, mask.height
+    stride = mask._stride
+    data = mask._data
+    for y in range(height):
+        row = y*stride
+        i = y*width
+        for k in range(stride):
+            n = min(32, width - (k << 5))
+            word = 0
+            for x in range(i, i+n):
+                word = word << 1
+                pixel = pixels[x]
+                if ((pixel >> ashift) & 0xff) >= alpha:
+                    r = (pixel >> rshift) & 0xff
+                    g = (pixel >> gshift) & 0xff
+                    b = (pixel >> bshift) & 0xff
+                    if (r1 <= r <= r2 and
+                        g1 <= g <= g2 and
+                        b1 <= b <= b2):
+                        word = word | 1
+            if n < 32:
+                word = word << (32-n)
+            data[row+k] = word
+            i += n
     return mask
 
 
+def _get_pixels(surface):
+    """
+    Return surface pixels as a Uint32Array view of the ImageData.
+    """
+    imagedata = surface.getImageData(0, 0, surface.width, surface.height)
+    return Uint32Array(imagedata.data.buffer)
+
+
+_shift = None
+
+def _channel_shift():
+    """
+    Return bit shift of r,g,b,a channels in a Uint32Array pixel.
+    """
+    global _shift
+    if _shift is None:
+        if Uint8Array(Uint32Array([1]).buffer)[0]:
+            _shift = (0, 8, 16, 24)
+        else:
+            _shift = (24, 16, 8, 0)
+    return _shift
+
+
 class Mask:
     """
     Mask object.
@@ -108,13 +138,13 @@ class Mask:
         Initialize Mask object.
 
         The size argument is (width, height) of the mask.
-        The mask is represented by a list of Bitset.
+        The mask is stored in a Uint32Array, each row a stride of 32-bit words.
         """
         self.width = int(size[0])
         self.height = int(size[1])
-        self.bit = []
-        for bitset in range(self.height):
-            self.bit.append(BitSet(self.width))
+        self._stride = (self.width + 31) >> 5
+        self._data = Uint32Array(self._stride * self.height)
+        self._bit = None
 
     def __str__(self):
         return self.toString()
@@ -122,6 +152,23 @@ class Mask:
     def __repr__(self):
         return '{}({})'.format(self.__class__, repr(self.__dict__))
 
+    @property
+    def bit(self):
+        """
+        List of row Bitset.
+
+        Compatibility view of mask rows sharing the mask storage.
+        """
+        if self._bit is None:
+            self._bit = []
+            for y in range(self.height):
+                bitset = BitSet32(1)
+                bitset._data = self._data.subarray(y*self._stride,
+                                                   (y+1)*self._stride)
+                bitset._width = self.width
+                self._bit.append(bitset)
+        return self._bit
+
     def get_size(self):
         """
         Return width, height of mask.
@@ -132,7 +179,12 @@ class Mask:
         """
         Return bit setting for given pos.
         """
-        return self.bit[pos[1]].get(pos[0])
+        x = pos[0]
+        y = pos[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError('mask index out of range')
+        index = y*self._stride + (x >> 5)
+        return bool(self._data[index] & _bitmask[x & 31])
 
     def set_at(self, pos, value=1):
         """
@@ -140,66 +192,66 @@ class Mask:
 
         Optional value to set bit, either 1 or 0, defaults to 1.
         """
-        self.bit[pos[1]].set(pos[0], value)
+        x = pos[0]
+        y = pos[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError('mask index out of range')
+        index = y*self._stride + (x >> 5)
+        if value:
+            self._data[index] = self._data[index] | _bitmask[x & 31]
+        else:
+            self._data[index] = self._data[index] & ~_bitmask[x & 31]
         return None
 
     def fill(self):
         """
         Fill mask.
         """
-        for bitset in self.bit:
-            bitset.fill()
+        self._data.fill(0xffffffff)
+        self._clear_padding()
         return None
 
     def clear(self):
         """
         Clear mask.
         """
-        for bitset in self.bit:
-            bitset.clear()
+        self._data.fill(0)
         return None
 
     def invert(self):
         """
         Invert bit value in mask.
         """
-        for bitset in self.bit:
-            bitset.flip(0,self.width)
+        data = self._data
+        for i in range(data.length):
+            data[i] = ~data[i]
+        self._clear_padding()
         return None
 
     def count(self):
         """
         Return count of true bits in mask.
         """
+        data = self._data
+        stride = self._stride
+        end_mask = _highmask[self.width & 31]
         true_bits = 0
-        for bitset in self.bit:
-            true_bits += bitset.cardinality()
+        if not stride:
+            return true_bits
+        for row in range(0, data.length, stride):
+            last = row + stride - 1
+            for i in range(row, last):
+                true_bits += _popcount(data[i])
+            true_bits += _popcount(data[last] & end_mask)
         return true_bits
 
     def overlap(self, mask, offset):
         """
-        Return True if mask at offset position overlap with this mask.
+        Return first point of overlap of mask at offset position with this mask.
+
+        Return None if no overlap.
         """
-        if offset[0] > 0:
-            x1 = offset[0]
-            x2 = 0
-        else:
-            x1 = 0
-            x2 = -offset[0]
-        if offset[1] > 0:
-            y1 = offset[1]
-            y2 = 0
-        else:
-            y1 = 0
-            y2 = -offset[1]
-        w = min(self.width-x1, mask.width-x2)
-        h = min(self.height-y1, mask.height-y2)
-        if w > 0 and h > 0:
-            for y in range(h):
-                if self.bit[y1+y].get(x1, x1+w).intersects(
-                              mask.bit[y2+y].get(x2, x2+w)):
-                    return True
-        return None
+        return _overlap(self, mask, offset)
 
     def toString(self, bit=('1','0')):
         """
@@ -209,15 +261,29 @@ class Mask:
         """
         cbit = {True:bit[0], False:bit[1]}
         cbitset = []
-        for bitset in self.bit:
+        for y in range(self.height):
             cbitset.append('\n')
-            cbitset.extend([cbit[bitset.get(i)]
-                            for i in range(self.width)])
+            cbitset.extend([cbit[self.get_at((x,y))]
+                            for x in range(self.width)])
         bitstr = ''.join(cbitset)
         return bitstr
 
+    def _clear_padding(self):
+        if not self.width & 31:
+            return
+        data = self._data
+        end_mask = _highmask[self.width & 31]
+        for last in range(self._stride-1, data.length, self._stride):
+            data[last] = data[last] & end_mask
+
 
 def _overlap(mask1, mask2, offset):
+    """
+    Return first point of mask1 that overlap mask2 at offset, or None.
+
+    Rows are compared as 32-bit words, with the words of the mask at
+    positive x offset shifted into alignment with the other mask.
+    """
     if offset[0] > 0:
         x1 = offset[0]
         x2 = 0
@@ -232,67 +298,51 @@ def _overlap(mask1, mask2, offset):
         y2 = -offset[1]
     w = min(mask1.width-x1, mask2.width-x2)
     h = min(mask1.height-y1, mask2.height-y2)
-    if w > 0 and h > 0:
-        for y in range(h):
-            bitset1 = mask1.bit[y1+y]
-            bitset2 = mask2.bit[y2+y]
-            _bitset1 = _bitset_get(bitset1, x1, x1+w)
-            _bitset2 = _bitset_get(bitset2, x2, x2+w)
-            intersect = _intersects(_bitset1, _bitset2)
-            _bitsetPool_set(_bitset1)
-            _bitsetPool_set(_bitset2)
-            if intersect:
-                return True
-    return False
-
-
-def _intersects(bitset1, bitset2):
-    for dat in range(bitset1._data.length):
-        data1 = bitset1._data
-        data2 = bitset2._data
-        intersect = data1[dat] & data2[dat]
-        if intersect:
-            return True
-    return False
-
-
-def _bitset_get(bitset, index, toIndex):
-    data = bitset._data
-    _bitset = _bitsetPool_get(toIndex-index)
-    ix = 0
-    if toIndex > bitset._width:
-        toIndex = bitset._width
-    for i in range(index, toIndex):
-        _bitset_set(_bitset, ix,
-            bool(data[int(i/bitset._bit)] & bitset._bitmask[i%bitset._bit]))
-        ix += 1
-    return _bitset
-
-
-def _bitset_set(bitset, index, value):
-    data = bitset._data
-    if value:
-        data[int(index/bitset._bit)] = (
-            data[int(index/bitset._bit)] | bitset._bitmask[index%bitset._bit])
-    else:
-        data[int(index/bitset._bit)] = (
-            data[int(index/bitset._bit)] & ~(bitset._bitmask[index%bitset._bit]))
-
-
-_bitsetPool = {}
-
-def _bitsetPool_get(size):
-    if size not in _bitsetPool:
-        _bitsetPool[size] = []
-    if len(_bitsetPool[size]) > 0:
-        bitset = _bitsetPool[size].pop()
+    if w <= 0 or h <= 0:
+        return None
+    if x1 > 0:
+        mask_a, ya, mask_b, yb, shift = mask1, y1, mask2, y2, x1
     else:
-        bitset = BitSet(size)
-    return bitset
-
-def _bitsetPool_set(bitset):
-    data = bitset._data
-    for i in range(data.length):
-        data[i] = 0
-    _bitsetPool[bitset._width].append(bitset)
-
+        mask_a, ya, mask_b, yb, shift = mask2, y2, mask1, y1, x2
+    shift_word = shift >> 5
+    shift_bit = shift & 31
+    shift_mask = _lowmask[shift_bit]
+    words = (w + 31) >> 5
+    last = words - 1
+    end_mask = _highmask[w & 31]
+    data_a = mask_a._data
+    data_b = mask_b._data
+    stride_a = mask_a._stride
+    stride_b = mask_b._stride
+    for y in range(h):
+        row_a = (ya+y) * stride_a
+        row_end = row_a + stride_a
+        row_a += shift_word
+        row_b = (yb+y) * stride_b
+        for k in range(words):
+            j = row_a + k
+            if shift_bit:
+                word = data_a[j] << shift_bit
+                if j+1 < row_end:
+                    word = word | ((data_a[j+1] >> (32-shift_bit)) & shift_mask)
+            else:
+                word = data_a[j]
+            word = word & data_b[row_b+k]
+            if k == last:
+                word = word & end_mask
+            if word:
+                return (x1 + (k << 5) + Math.clz32(word), y1 + y)
+    return None
+
+
+def _popcount(word):
+    word = word - ((word >> 1) & 0x55555555)
+    word = (word & 0x33333333) + ((word >> 2) & 0x33333333)
+    return ((((word + (word >> 4)) & 0x0f0f0f0f) * 0x01010101) >> 24) & 0xff
+
+
+#_bitmask[n]: bit n from word high bit
+#_lowmask[n]: low n bits; _highmask[n]: high n bits, full word for n=0
+_bitmask = [2**(31-n) for n in range(32)]
+_lowmask = [2**n - 1 for n in range(32)]
+_highmask = [2**32 - 2**(32-n) if n else 2**32 - 1 for n in range(32)]
@@ -7,7 +7,7 @@
 The module provides function to load sounds and mixer to play sounds.
 """
 
-from pyjsdl.time import Time
+from pyjsdl.time import _wheel
 from pyjsdl import env
 from pyjsdl import constants as Const
 
@@ -37,7 +37,6 @@ class Mixer:
         for id in range(self._channel_max):
             self._get_channel(id)
         self.music = Music()
-        self._time = Time()
         self._timerid = 0
         self._processing = False
         self._active = False
@@ -209,7 +208,7 @@ class Mixer:
         self._channel_process.add(id)
         if not self._processing:
             self._processing = True
-            self._timerid = self._time.set_interval(self, 10)
+            self._timerid = _wheel.schedule(self.run, 10, 10)
 
     def run(self):
         """
@@ -226,13 +225,13 @@ class Mixer:
                     self._channel_process.discard(id)
                 if len(self._channel_process) == 0:
                     self._processing = False
-                    self._time.clear_interval(self._timerid)
+                    _wheel.cancel(self._timerid)
         else:
             if len(self._channel_process) > 0:
                 for i in range(len(self._channel_process)):
                     self._channel_process.pop()
             self._processing = False
-            self._time.clear_interval(self._timerid)
+            _wheel.cancel(self._timerid)
 
     def _activate_channel(self, id):
         if id > self._channel_reserved_num-1:
@@ -434,7 +433,7 @@ class Channel:
         self._loops = loops
         if maxtime:
             self._maxtime = maxtime / 1000.0
-            self._timerid = self._mixer._time.set_timeout(self, maxtime)
+            self._timerid = _wheel.schedule(self.run, maxtime)
         if fade_ms:
             self._fadein = fade_ms / 1000.0
             self._mixer._process(self._id)
@@ -464,7 +463,7 @@ class Channel:
         self._loops = loops
         if maxtime:
             self._maxtime = maxtime / 1000.0
-            self._timerid = self._mixer._time.set_timeout(self, maxtime)
+            self._timerid = _wheel.schedule(self.run, maxtime)
         if fade_ms:
             self._fadein = fade_ms / 1000.0
             self._mixer._process(self._id)
@@ -533,7 +532,7 @@ class Channel:
                 self._loops = 0
                 self.stop()
             else:
-                self._timerid = self._mixer._time.set_timeout(self, 10)
+                self._timerid = _wheel.schedule(self.run, 10)
 
     def _onended(self, event):
         if not self._loops:
@@ -563,7 +562,7 @@ class Channel:
             self._pause = False
             self._loops = 0
             if self._maxtime:
-                self._mixer._time.clear_timeout(self._timerid)
+                _wheel.cancel(self._timerid)
                 self._maxtime = 0
             self._fadein = 0
             self._fadeout = 0
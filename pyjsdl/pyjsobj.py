@@ -287,6 +287,7 @@ _listener = {}
 
 class HTML5Canvas(FocusElement):
     _identity = 0
+    _ctx_attr = None
 
     def __init__(self, width, height):
         FocusElement.__init__(self)
@@ -304,17 +305,35 @@ class HTML5Canvas(FocusElement):
         self._element.style.padding = '0px'
         self._element.style['vertical-align'] = 'bottom'
         self.canvas = self._element
-        self._ctx = self._element.getContext('2d')
+        self._ctx = self.getContext('2d', self._ctx_attr)
+        self._version = 0
+        self._reset_state()
+
+    def _reset_state(self):
+        #shadow of context state, to skip assignment of unchanged state
+        self._state_alpha = 1.0
+        self._state_fill = '#000000'
+        self._state_stroke = '#000000'
+        self._state_linewidth = 1.0
+        self._state_font = '10px sans-serif'
+        self._state_align = 'start'
+        self._state_baseline = 'alphabetic'
+        self._state_composite = 'source-over'
+        self._state_smoothing = True
+        self._state_stack = []
 
     def resize(self, width, height):
         self.width = width
         self.height = height
+        self._version += 1
         self._element.width = width
         self._element.height = height
         self._element.style.width = str(width)+'px'
         self._element.style.height = str(height)+'px'
+        self._reset_state()
 
     def drawImage(self, image, *args):
+        self._version += 1
         ln = len(args)
         if ln == 2:
             self._ctx.drawImage(image, args[0], args[1])
@@ -325,32 +344,80 @@ class HTML5Canvas(FocusElement):
                                        args[4], args[5], args[6], args[7])
 
     def fill(self):
+        self._version += 1
         self._ctx.fill()
 
     def setFillStyle(self, style):
-        self._ctx.fillStyle = str(style)
+        style = str(style)
+        if style != self._state_fill:
+            self._state_fill = style
+            self._ctx.fillStyle = style
 
     def fillRect(self, x, y, width, height):
+        self._version += 1
         self._ctx.fillRect(x, y, width, height)
 
     def py_clear(self):
         #clear()
+        self._version += 1
         self._ctx.clearRect(0, 0, self.width, self.height)
 
     def setLineWidth(self, width):
-        self._ctx.lineWidth = width
+        if width != self._state_linewidth:
+            self._state_linewidth = width
+            self._ctx.lineWidth = width
 
     def setStrokeStyle(self, style):
-        self._ctx.strokeStyle = str(style)
+        style = str(style)
+        if style != self._state_stroke:
+            self._state_stroke = style
+            self._ctx.strokeStyle = style
+
+    def setGlobalAlpha(self, alpha):
+        if alpha != self._state_alpha:
+            self._state_alpha = alpha
+            self._ctx.globalAlpha = alpha
+
+    def setGlobalCompositeOperation(self, operation):
+        if operation != self._state_composite:
+            self._state_composite = operation
+            self._ctx.globalCompositeOperation = operation
+
+    def setImageSmoothingEnabled(self, enabled):
+        if enabled != self._state_smoothing:
+            self._state_smoothing = enabled
+            self._ctx.imageSmoothingEnabled = enabled
 
     def strokeRect(self, x, y, width, height):
+        self._version += 1
         self._ctx.strokeRect(x, y, width, height)
 
     def saveContext(self):
         self._ctx.save()
+        self._state_stack.append((self._state_alpha,
+                                  self._state_fill,
+                                  self._state_stroke,
+                                  self._state_linewidth,
+                                  self._state_font,
+                                  self._state_align,
+                                  self._state_baseline,
+                                  self._state_composite,
+                                  self._state_smoothing))
 
     def restoreContext(self):
         self._ctx.restore()
+        if not len(self._state_stack):
+            return
+        state = self._state_stack.pop()
+        self._state_alpha = state[0]
+        self._state_fill = state[1]
+        self._state_stroke = state[2]
+        self._state_linewidth = state[3]
+        self._state_font = state[4]
+        self._state_align = state[5]
+        self._state_baseline = state[6]
+        self._state_composite = state[7]
+        self._state_smoothing = state[8]
 
     def translate(self, x, y):
         self._ctx.translate(x,y)
@@ -380,21 +447,38 @@ class HTML5Canvas(FocusElement):
         self._ctx.lineTo(x, y)
 
     def stroke(self):
+        self._version += 1
         self._ctx.stroke()
 
+    def fillPath(self, path):
+        self._version += 1
+        self._ctx.fill(path)
+
+    def strokePath(self, path):
+        self._version += 1
+        self._ctx.stroke(path)
+
     def setFont(self, font):
-        self._ctx.font = font
+        if font != self._state_font:
+            self._state_font = font
+            self._ctx.font = font
 
     def setTextAlign(self, align):
-        self._ctx.textAlign = align
+        if align != self._state_align:
+            self._state_align = align
+            self._ctx.textAlign = align
 
     def setTextBaseline(self, baseline):
-        self._ctx.textBaseline = baseline
+        if baseline != self._state_baseline:
+            self._state_baseline = baseline
+            self._ctx.textBaseline = baseline
 
     def fillText(self, text, x, y):
+        self._version += 1
         self._ctx.fillText(text, x, y)
 
     def strokeText(self, text, x, y):
+        self._version += 1
         self._ctx.strokeText(text, x, y)
 
     def measureText(self, text):
@@ -404,6 +488,7 @@ class HTML5Canvas(FocusElement):
         return self._ctx.getImageData(x, y, width, height)
 
     def putImageData(self, *args):
+        self._version += 1
         if len(args) == 3:
             self._ctx.putImageData(args[0], args[1], args[2])
         else:
@@ -0,0 +1,287 @@
+#Pyjsdl - Copyright (C) 2021 James Garnon <https://gatc.ca/>
+#Released under the MIT License <https://opensource.org/licenses/MIT>
+
+"""
+**Replay module**
+
+The module provides input recording and deterministic replay.
+
+A Recorder logs the events delivered by event.get/poll/wait, the
+Clock.tick deltas and the timestamp of each animation frame. A Replay
+of the log feeds the events back at the same frames, with live input
+blocked and time.get_ticks/Clock.tick returning the recorded time,
+so a session can be reproduced for benchmarking and regression tests.
+
+The log is a JSON array [version, frames, events, ticks]:
+
+    * frames: ms time of each frame from start of recording.
+    * events: [frame, type, [[attr, value], ...]] of each event.
+    * ticks: [frame, ms] of each Clock.tick.
+"""
+
+from pyjsdl.event import JEvent
+from pyjsdl.time import Clock
+from pyjsdl import constants as Const
+from pyjsdl import env
+
+
+_log_version = 1
+
+
+class Recorder:
+    """
+    Recorder object.
+    """
+
+    _replay = False
+
+    def __init__(self):
+        """
+        Initialize Recorder object.
+
+        Call start to begin recording, and stop and dumps to retrieve log.
+        """
+        self.frames = []
+        self.events = []
+        self.ticks = []
+        self._time0 = 0.0
+        self._hook = None
+        self._active = False
+
+    def __str__(self):
+        s = '<{}({} frames, {} events)>'
+        return s.format(self.__class__.__name__,
+                        len(self.frames), len(self.events))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def start(self):
+        """
+        Start recording, clearing previous log.
+        """
+        if self._active:
+            return None
+        self._time0 = window.performance.now()
+        self.frames = [0.0]
+        self.events = []
+        self.ticks = []
+        env.event._log = self
+        Clock._log = self
+        self._hook = self._frame
+        env.canvas._frame_hooks.append(self._hook)
+        self._active = True
+        return None
+
+    def stop(self):
+        """
+        Stop recording.
+        """
+        if not self._active:
+            return None
+        env.event._log = None
+        Clock._log = None
+        env.canvas._frame_hooks.remove(self._hook)
+        self._active = False
+        return None
+
+    def is_active(self):
+        """
+        Check if recording.
+        """
+        return self._active
+
+    def get_log(self):
+        """
+        Return log as [version, frames, events, ticks].
+        """
+        return [_log_version, self.frames, self.events, self.ticks]
+
+    def dumps(self):
+        """
+        Return log as JSON string.
+        """
+        return JSON.stringify(self.get_log())
+
+    def toString(self):
+        return self.__str__()
+
+    def deliver(self, events):
+        frame = len(self.frames) - 1
+        for evt in events:
+            if not isinstance(evt, JEvent):
+                continue
+            attrs = []
+            names = evt.__slots__ if evt._attrs is None else evt._attrs
+            for name in names:
+                if name != 'type' and name != 'event':
+                    attrs.append([name, getattr(evt, name)])
+            self.events.append([frame, evt.type, attrs])
+
+    def tick(self, diff):
+        self.ticks.append([len(self.frames) - 1, diff])
+        return diff
+
+    def _frame(self):
+        self.frames.append(window.performance.now() - self._time0)
+
+
+class Replay:
+    """
+    Replay object.
+    """
+
+    _replay = True
+
+    def __init__(self, log, callback=None):
+        """
+        Initialize Replay object.
+
+        Argument log from Recorder.dumps or Recorder.get_log.
+        Optional callback is called when replay is done.
+        """
+        if isinstance(log, str):
+            log = JSON.parse(log)
+        if log[0] != _log_version:
+            raise ValueError('unsupported replay log version')
+        self.frames = log[1]
+        self.events = log[2]
+        self.ticks = log[3]
+        self.callback = callback
+        self._index = 0
+        self._event_index = 0
+        self._tick_index = 0
+        self._base = 0.0
+        self._now = None
+        self._hook = None
+        self._active = False
+        self._done = False
+
+    def __str__(self):
+        s = '<{}({}/{} frames)>'
+        return s.format(self.__class__.__name__,
+                        self._index, len(self.frames))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def start(self):
+        """
+        Start replay.
+
+        Live input is blocked and time is set from the log until replay is done.
+        """
+        if self._active:
+            return None
+        if not len(self.frames):
+            self._done = True
+            return None
+        self._index = 0
+        self._event_index = 0
+        self._tick_index = 0
+        self._done = False
+        self._now = window.performance.now
+        self._base = self._now.call(window.performance) - self.frames[0]
+        window.performance.now = self._time
+        env.event._inputBlocked = True
+        env.event._log = self
+        Clock._log = self
+        self._hook = self._frame
+        env.canvas._frame_hooks.append(self._hook)
+        self._active = True
+        self._feed()
+        return None
+
+    def stop(self):
+        """
+        Stop replay, restoring live input and time.
+        """
+        if not self._active:
+            return None
+        window.performance.now = self._now
+        env.event._inputBlocked = False
+        env.event._log = None
+        Clock._log = None
+        env.canvas._frame_hooks.remove(self._hook)
+        self._active = False
+        return None
+
+    def is_active(self):
+        """
+        Check if replaying.
+        """
+        return self._active
+
+    def is_done(self):
+        """
+        Check if replay reached end of log.
+        """
+        return self._done
+
+    def get_frame(self):
+        """
+        Return current replay frame.
+        """
+        return self._index
+
+    def toString(self):
+        return self.__str__()
+
+    def deliver(self, events):
+        pass
+
+    def tick(self, diff):
+        ticks = self.ticks
+        while (self._tick_index < len(ticks) and
+               ticks[self._tick_index][0] < self._index):
+            self._tick_index += 1
+        if (self._tick_index < len(ticks) and
+                ticks[self._tick_index][0] == self._index):
+            diff = ticks[self._tick_index][1]
+            self._tick_index += 1
+        return diff
+
+    def _time(self):
+        return self._base + self.frames[self._index]
+
+    def _frame(self):
+        if self._index + 1 >= len(self.frames):
+            self.stop()
+            self._done = True
+            if self.callback:
+                self.callback()
+            return
+        self._index += 1
+        self._feed()
+
+    def _feed(self):
+        events = self.events
+        while (self._event_index < len(events) and
+               events[self._event_index][0] <= self._index):
+            item = events[self._event_index]
+            self._event_index += 1
+            attr = dict(item[2])
+            self._update_state(item[1], attr)
+            env.event.post(env.event.Event(item[1], attr))
+
+    def _update_state(self, eventType, attr):
+        event = env.event
+        if eventType in (Const.MOUSEMOTION,
+                         Const.MOUSEBUTTONDOWN,
+                         Const.MOUSEBUTTONUP):
+            event.mouseEvt['pre'] = event.mouseEvt['pos']
+            event.mouseEvt['pos'] = _Pointer(attr['pos'])
+            if eventType != Const.MOUSEMOTION and 1 <= attr['button'] <= 3:
+                pressed = eventType == Const.MOUSEBUTTONDOWN
+                event.mousePress[attr['button']-1] = pressed
+        elif eventType in (Const.KEYDOWN, Const.KEYUP):
+            if attr['key'] in (Const.K_ALT, Const.K_CTRL, Const.K_SHIFT):
+                event.keyPress[attr['key']] = eventType == Const.KEYDOWN
+
+
+class _Pointer:
+
+    def __init__(self, pos):
+        clientRect = env.canvas._clientRect
+        self.clientX = pos[0] + clientRect.left
+        self.clientY = pos[1] + clientRect.top
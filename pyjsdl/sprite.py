@@ -9,7 +9,9 @@ The module provides sprite object functionality.
 
 from pyjsdl.rect import rectPool
 from pyjsdl import mask
-from pyjsdl.util import Dict
+from pyjsdl import constants as Const
+from pyjsdl.util import Dict, IdMap
+from pyjsdl import env
 from pyjsdl.pylib import int
 
 
@@ -36,7 +38,7 @@ class Sprite:
         """
         self._identity = Sprite._identity
         Sprite._identity += 1
-        self._groups = dict()
+        self._groups = IdMap()
         if len(groups) > 0:
             self.add(*groups)
 
@@ -114,12 +116,32 @@ class DirtySprite(Sprite):
 
     def __init__(self, *groups):
         """
-        Initialize Sprite object.
+        Initialize DirtySprite object.
 
-        Subclass not implemented.
+        Sprite subclass with attributes used by LayeredDirty group:
+        dirty: 0 not redrawn, 1 redrawn and reset to 0, 2 always redrawn.
+        visible: 0 not drawn, 1 drawn.
+        blendmode: 0 normal, BLEND_ADD/MULT/MIN/MAX or canvas composite operation.
+        source_rect: area of image to draw, None for whole image.
         """
+        self.dirty = 1
+        self.blendmode = 0
+        self.source_rect = None
+        self._visible = 1
+        if not hasattr(self, '_layer'):
+            self._layer = 0
         Sprite.__init__(self, *groups)
 
+    @property
+    def visible(self):
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+        self._visible = value
+        if self.dirty < 2:
+            self.dirty = 1
+
 
 class Group:
     """
@@ -136,11 +158,12 @@ class Group:
         """
         self._identity = Group._identity
         Group._identity += 1
-        self._sprites = dict()
+        self._sprites = IdMap()
+        self._spritelist = None
         if len(sprites) > 0:
             self.add(*sprites)
         self._clear_active = False
-        self._sprites_drawn = dict()
+        self._sprites_drawn = IdMap()
 
     def __str__(self):
         s = '<{}({} sprites)>'
@@ -150,15 +173,15 @@ class Group:
         return self.__str__()
 
     def __iter__(self):
-        for sprite in self._sprites.values():
+        for sprite in self._get_sprites():
             yield sprite
 
     def __getitem__(self, index):
-        #opov pragma disrupts __iter__ call, uses suboptimal __getitem__/__len__
-        return self._sprites.values()[index]
+        #opov pragma disrupts __iter__ call, uses __getitem__/__len__
+        return self._get_sprites()[index]
 
     def __contains__(self, sprite):
-        return str(id(sprite)) in self._sprites
+        return self._sprites.has(id(sprite))
 
     def __len__(self):
         return len(self._sprites)
@@ -167,7 +190,13 @@ class Group:
         """
         Return list of sprites in the group.
         """
-        return self._sprites.values()
+        return self._get_sprites()[:]
+
+    def _get_sprites(self):
+        #sprite list cached until group membership changes
+        if self._spritelist is None:
+            self._spritelist = self._sprites.values()
+        return self._spritelist
 
     def copy(self):
         """
@@ -184,9 +213,10 @@ class Group:
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) not in self._sprites:
-                    self._sprites[spriteID] = sprite
-                    sprite._groups[id(self)] = self
+                if not self._sprites.has(spriteID):
+                    self._sprites.set(spriteID, sprite)
+                    sprite._groups.set(id(self), self)
+                    self._spritelist = None
             else:
                 self.add(*sprite)
         return None
@@ -198,9 +228,10 @@ class Group:
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) in self._sprites:
+                if self._sprites.has(spriteID):
                     self._sprites.pop(spriteID)
                     sprite._groups.pop(id(self))
+                    self._spritelist = None
             else:
                 self.remove(*sprite)
         return None
@@ -211,7 +242,7 @@ class Group:
         """
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
-                if str(id(sprite)) not in self._sprites:
+                if not self._sprites.has(id(sprite)):
                     return False
             else:
                 if not self.has(*sprite):
@@ -222,13 +253,13 @@ class Group:
         """
         Draw sprite on surface.
         """
-        surface._blits([(sprite.image,sprite.rect) for sprite in self])
+        surface._blits([(sprite.image,sprite.rect)
+                        for sprite in self._get_sprites()])
         if self._clear_active:
             rectPool.extend(self._sprites_drawn.values())
             self._sprites_drawn.clear()
-            for sprite in self._sprites.keys():
-                self._sprites_drawn[sprite] = rectPool.copy(
-                                 self._sprites[sprite].rect)
+            for sprite in self._get_sprites():
+                self._sprites_drawn.set(id(sprite), rectPool.copy(sprite.rect))
         return None
 
     def clear(self, surface, background):
@@ -242,8 +273,8 @@ class Group:
         if background.width:
             surface._blit_clear(background, self._sprites_drawn.values())
         else:
-            for sprite in self._sprites_drawn.keys():
-                background(surface, self._sprites_drawn[sprite])
+            for rect in self._sprites_drawn.values():
+                background(surface, rect)
 
     def empty(self):
         """
@@ -252,6 +283,7 @@ class Group:
         for sprite in self._sprites.values():
             sprite._groups.pop(id(self))
         self._sprites.clear()
+        self._spritelist = None
         return None
 
     def update(self, *args):
@@ -260,7 +292,7 @@ class Group:
 
         Update sprites in group by calling sprite.update.
         """
-        for sprite in self._sprites.values():
+        for sprite in self._get_sprites():
             sprite.update(*args)
         return None
 
@@ -313,8 +345,9 @@ class GroupSingle(Group):
         Addition replaces existing sprite.
         """
         self.empty()
-        self._sprites[id(sprite)] = sprite
-        sprite._groups[id(self)] = self
+        self._sprites.set(id(sprite), sprite)
+        sprite._groups.set(id(self), self)
+        self._spritelist = None
         return None
 
     @property
@@ -351,31 +384,32 @@ class RenderUpdates(Group):
 
         Returns list of Rect of sprites updated, which can be passed to display.update.
         """
-        surface._blits([(sprite.image,sprite.rect) for sprite in self])
+        surface._blits([(sprite.image,sprite.rect)
+                        for sprite in self._get_sprites()])
         if self._clear_active:
             rectPool.extend(self.changed_areas)
             self.changed_areas[:] = []
-            for sprite in self._sprites.keys():
-                if sprite in self._sprites_drawn:
-                    if self._sprites_drawn[sprite].intersects(
-                                   self._sprites[sprite].rect):
-                        self._sprites_drawn[sprite].union_ip(
-                                  self._sprites[sprite].rect)
+            for sprite in self._get_sprites():
+                spriteID = id(sprite)
+                if self._sprites_drawn.has(spriteID):
+                    if self._sprites_drawn.get(spriteID).intersects(
+                                   sprite.rect):
+                        self._sprites_drawn.get(spriteID).union_ip(
+                                  sprite.rect)
                     else:
                         self.changed_areas.append(
-                            rectPool.copy(self._sprites[sprite].rect))
+                            rectPool.copy(sprite.rect))
                 else:
                     self.changed_areas.append(
-                        rectPool.copy(self._sprites[sprite].rect))
+                        rectPool.copy(sprite.rect))
             self.changed_areas.extend(self._sprites_drawn.values())
             self._sprites_drawn.clear()
-            for sprite in self._sprites.keys():
-                self._sprites_drawn[sprite] = rectPool.copy(
-                                 self._sprites[sprite].rect)
+            for sprite in self._get_sprites():
+                self._sprites_drawn.set(id(sprite), rectPool.copy(sprite.rect))
         else:
             rectPool.extend(self.changed_areas)
             self.changed_areas[:] = []
-            for sprite in self._sprites.values():
+            for sprite in self._get_sprites():
                 self.changed_areas.append(rectPool.copy(sprite.rect))
         return self.changed_areas
 
@@ -392,25 +426,20 @@ class OrderedUpdates(RenderUpdates):
         RenderUpdates subclass that maintains order of sprites.
         Can optionally be called with sprite(s) to add.
         """
-        self._orderedsprites = []
+        self._order = _SpriteArray()
         RenderUpdates.__init__(self, *sprites)
 
-    def __iter__(self):
-        for sprite in self._orderedsprites:
-            yield sprite
-
-    def sprites(self):
-        """
-        Return ordered list of sprites in the group.
-        """
-        return self._orderedsprites[:]
+    def _get_sprites(self):
+        if self._spritelist is None:
+            self._spritelist = self._order.sprites()[:]
+        return self._spritelist
 
     def copy(self):
         """
         Return copy of group.
         """
         newgroup = RenderUpdates.copy(self)
-        newgroup._orderedsprites = self._orderedsprites[:]
+        newgroup._order = self._order.copy()
         return newgroup
 
     def add(self, *sprites):
@@ -422,10 +451,11 @@ class OrderedUpdates(RenderUpdates):
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) not in self._sprites:
-                    self._sprites[spriteID] = sprite
-                    sprite._groups[id(self)] = self
-                    self._orderedsprites.append(sprite)
+                if not self._sprites.has(spriteID):
+                    self._sprites.set(spriteID, sprite)
+                    sprite._groups.set(id(self), self)
+                    self._order.append(sprite)
+                    self._spritelist = None
             else:
                 self.add(*sprite)
         return None
@@ -437,10 +467,11 @@ class OrderedUpdates(RenderUpdates):
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) in self._sprites:
+                if self._sprites.has(spriteID):
                     self._sprites.pop(spriteID)
                     sprite._groups.pop(id(self))
-                    self._orderedsprites.remove(sprite)
+                    self._order.remove(sprite)
+                    self._spritelist = None
             else:
                 self.remove(*sprite)
         return None
@@ -449,7 +480,7 @@ class OrderedUpdates(RenderUpdates):
         """
         Empty group.
         """
-        self._orderedsprites[:] = []
+        self._order.clear()
         RenderUpdates.empty(self)
 
 
@@ -474,6 +505,7 @@ class LayeredUpdates(OrderedUpdates):
         """
         self._layer = {}
         self._layers = []
+        self._sprite_layer = IdMap()
         if 'default_layer' not in kwargs:
             self._default_layer = 0
         else:
@@ -482,23 +514,27 @@ class LayeredUpdates(OrderedUpdates):
             self._override_layer = None
         else:
             self._override_layer = kwargs['layer']
-        OrderedUpdates.__init__(self, *sprites)
+        RenderUpdates.__init__(self, *sprites)
 
     # __pragma__ ('nokwargs')
 
+    def _get_sprites(self):
+        if self._spritelist is None:
+            sprites = []
+            for layer in self._layers:
+                sprites.extend(self._layer[layer].sprites())
+            self._spritelist = sprites
+        return self._spritelist
+
     def copy(self):
         """
         Return copy of group.
         """
-        newgroup = OrderedUpdates.copy(self)
-        for layer in self._layer:
-            layer_data = {}
-            layer_data['sprite'] = set()
-            for spriteID in self._layer[layer]['sprite']:
-                layer_data['sprite'].add(spriteID)
-            layer_data['index'] = self._layer[layer]['index'][:]
-            newgroup._layer[layer] = layer_data
+        newgroup = RenderUpdates.copy(self)
+        for layer in self._layers:
+            newgroup._layer[layer] = self._layer[layer].copy()
         newgroup._layers = self._layers[:]
+        newgroup._sprite_layer = self._sprite_layer.copy()
         newgroup._default_layer = self._default_layer
         return newgroup
 
@@ -517,9 +553,9 @@ class LayeredUpdates(OrderedUpdates):
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) not in self._sprites:
-                    self._sprites[spriteID] = sprite
-                    sprite._groups[id(self)] = self
+                if not self._sprites.has(spriteID):
+                    self._sprites.set(spriteID, sprite)
+                    sprite._groups.set(id(self), self)
                     if self._override_layer is not None:
                         layer = self._override_layer
                     elif hasattr(sprite, '_layer'):
@@ -528,16 +564,9 @@ class LayeredUpdates(OrderedUpdates):
                         layer = self._default_layer
                     if str(layer) not in self._layer:
                         self._add_layer(layer)
-                    self._layer[layer]['sprite'].add(spriteID)
-                    i = self._layer[layer]['index'][1]
-                    self._orderedsprites.insert(i, sprite)
-                    self._layer[layer]['index'][1] += 1
-                    index = self._layers.index(layer)
-                    while index < len(self._layers) - 1:
-                        index += 1
-                        _layer = self._layers[index]
-                        self._layer[_layer]['index'][0] += 1
-                        self._layer[_layer]['index'][1] += 1
+                    self._layer[layer].append(sprite)
+                    self._sprite_layer.set(spriteID, layer)
+                    self._spritelist = None
             else:
                 if self._override_layer is not None:
                     kwargs['layer'] = self._override_layer
@@ -550,13 +579,7 @@ class LayeredUpdates(OrderedUpdates):
     def _add_layer(self, layer):
         self._layers.append(layer)
         self._layers.sort()
-        index = self._layers.index(layer)
-        if index > 0:
-            _layer = self._layers[index-1]
-            i = self._layer[_layer]['index'][1]
-        else:
-            i = 0
-        self._layer[layer] = {'sprite':set(), 'index':[i,i]}
+        self._layer[layer] = _SpriteArray()
 
     def remove(self, *sprites):
         """
@@ -565,25 +588,16 @@ class LayeredUpdates(OrderedUpdates):
         for sprite in sprites:
             if hasattr(sprite, '_groups'):
                 spriteID = id(sprite)
-                if str(spriteID) in self._sprites:
+                if self._sprites.has(spriteID):
                     self._sprites.pop(spriteID)
                     sprite._groups.pop(id(self))
-                    for layer in self._layers:
-                        if spriteID in self._layer[layer]['sprite']:
-                            break
-                    self._layer[layer]['sprite'].remove(spriteID)
-                    self._layer[layer]['index'][1] -= 1
-                    index = self._layers.index(layer)
-                    while index < len(self._layers) - 1:
-                        index += 1
-                        _layer = self._layers[index]
-                        self._layer[_layer]['index'][0] -= 1
-                        self._layer[_layer]['index'][1] -= 1
-                    if (self._layer[layer]['index'][0]
-                            == self._layer[layer]['index'][1]):
+                    layer = self._sprite_layer.pop(spriteID)
+                    layer_sprites = self._layer[layer]
+                    layer_sprites.remove(sprite)
+                    if not len(layer_sprites):
                         self._layer.pop(layer)
                         self._layers.remove(layer)
-                    self._orderedsprites.remove(sprite)
+                    self._spritelist = None
             else:
                 self.remove(*sprite)
         return None
@@ -594,14 +608,15 @@ class LayeredUpdates(OrderedUpdates):
         """
         self._layers[:] = []
         self._layer.clear()
-        OrderedUpdates.empty(self)
+        self._sprite_layer.clear()
+        RenderUpdates.empty(self)
 
     def get_sprites_at(self, position):
         """
         Return sprites at position.
         """
         colliding_sprites = []
-        for sprite in self._orderedsprites:
+        for sprite in self._get_sprites():
             if sprite.rect.collidepoint(position):
                 colliding_sprites.append(sprite)
         return colliding_sprites
@@ -610,14 +625,13 @@ class LayeredUpdates(OrderedUpdates):
         """
         Return sprite at sprites index.
         """
-        return self._orderedsprites[index]
+        return self._get_sprites()[index]
 
     def remove_sprites_of_layer(self, layer):
         """
         Return sprites removed from layer.
         """
-        i,j = self._layer[layer]['index']
-        sprites = self._orderedsprites[i:j]
+        sprites = self.get_sprites_from_layer(layer)
         for sprite in sprites:
             self.remove(sprite)
         return sprites
@@ -640,9 +654,10 @@ class LayeredUpdates(OrderedUpdates):
         """
         Return layer of sprite.
         """
-        for layer in self._layers:
-            if id(sprite) in self._layer[layer]['sprite']:
-                return layer
+        spriteID = id(sprite)
+        if self._sprite_layer.has(spriteID):
+            return self._sprite_layer.get(spriteID)
+        return None
 
     def get_top_layer(self):
         """
@@ -679,15 +694,17 @@ class LayeredUpdates(OrderedUpdates):
         """
         Return sprite at top.
         """
-        top = len(self._orderedsprites)-1
-        return self._orderedsprites[top]
+        sprites = self._get_sprites()
+        top = len(sprites)-1
+        return sprites[top]
 
     def get_sprites_from_layer(self, layer):
         """
         Return sprites on layer.
         """
-        i,j = self._layer[layer]['index']
-        return self._orderedsprites[i:j]
+        if str(layer) not in self._layer:
+            return []
+        return self._layer[layer].sprites()[:]
 
     def switch_layer(self, layer1, layer2):
         """
@@ -704,13 +721,489 @@ class LayeredDirty(LayeredUpdates):
     LayeredDirty object.
     """
 
-    def __init__(self, *sprites):
+    # __pragma__ ('kwargs')
+
+    def __init__(self, *sprites, **kwargs):
         """
-        Initialize LayeredUpdates object.
+        Initialize LayeredDirty object.
+
+        LayeredUpdates subclass for DirtySprite that redraws only dirty
+        sprites and sprites overlapping the areas that changed.
+        Optional argument sprites to add to group.
+        Keyword arguments default_layer and layer as LayeredUpdates.
+        Optional keyword arguments _use_update (default True) for dirty
+        redraw, _time_threshold (ms) and _dirty_threshold (fraction of clip
+        area) beyond which drawing changes to full redraw.
+        """
+        self._clip = None
+        self._bgd = None
+        self._use_update = True
+        self._time_threshold = 1000.0/80.0
+        self._dirty_threshold = 0.5
+        self._time_exceeded = False
+        self._drawn_rect = IdMap()
+        self._lost_rect = []
+        if '_use_update' in kwargs:
+            self._use_update = kwargs['_use_update']
+        if '_time_threshold' in kwargs:
+            self._time_threshold = kwargs['_time_threshold']
+        if '_dirty_threshold' in kwargs:
+            self._dirty_threshold = kwargs['_dirty_threshold']
+        LayeredUpdates.__init__(self, *sprites, **kwargs)
 
-        Subclass not implemented.
+    # __pragma__ ('nokwargs')
+
+    def remove(self, *sprites):
         """
-        LayeredUpdates(self, *sprites)
+        Remove sprite(s) from group.
+        """
+        for sprite in sprites:
+            if hasattr(sprite, '_groups'):
+                spriteID = id(sprite)
+                if self._drawn_rect.has(spriteID):
+                    self._lost_rect.append(self._drawn_rect.pop(spriteID))
+                LayeredUpdates.remove(self, sprite)
+            else:
+                self.remove(*sprite)
+        return None
+
+    def empty(self):
+        """
+        Empty group.
+        """
+        self._lost_rect.extend(self._drawn_rect.values())
+        self._drawn_rect.clear()
+        LayeredUpdates.empty(self)
+
+    def draw(self, surface, bgd=None):
+        """
+        Draw sprite on surface.
+
+        Draw dirty sprites and sprites overlapping changed areas, which are
+        cleared with background surface from bgd argument or clear method.
+        Full redraw occurs if changed areas exceed dirty threshold of the
+        clip area, or previous draw exceeded the timing threshold.
+        Returns list of Rect of areas updated, which can be passed to display.update.
+        """
+        start = window.performance.now()
+        if bgd is not None:
+            self._bgd = bgd
+        bgd = self._bgd
+        if self._clip:
+            clip = self._clip
+        else:
+            clip = surface.get_rect()
+        update = self.changed_areas
+        rectPool.extend(update)
+        update[:] = []
+        sprites = self._get_sprites()
+        drawn = self._drawn_rect
+        full = not self._use_update or self._time_exceeded
+        if not full:
+            for rect in self._lost_rect:
+                self._add_area(update, rect, clip)
+            for sprite in sprites:
+                spriteID = id(sprite)
+                if sprite.dirty or not drawn.has(spriteID):
+                    if drawn.has(spriteID):
+                        self._add_area(update, drawn.get(spriteID), clip)
+                    if sprite.visible:
+                        self._add_area(update, sprite.rect, clip)
+            area = 0
+            for rect in update:
+                area += rect._width * rect._height
+            if area > self._dirty_threshold * clip._width * clip._height:
+                full = True
+        if full:
+            rectPool.extend(update)
+            update[:] = []
+            update.append(rectPool.copy(clip))
+            if bgd is not None:
+                surface._blit_clear(bgd, update)
+            for sprite in sprites:
+                if sprite.visible:
+                    self._draw_sprite(surface, sprite, clip)
+        else:
+            if bgd is not None and len(update) > 0:
+                surface._blit_clear(bgd, update)
+            for sprite in sprites:
+                if not sprite.visible:
+                    continue
+                if sprite.dirty or not drawn.has(id(sprite)):
+                    self._draw_sprite(surface, sprite, clip)
+                else:
+                    for rect in update:
+                        if rect.intersects(sprite.rect):
+                            self._draw_sprite(surface, sprite, rect)
+        rectPool.extend(self._lost_rect)
+        self._lost_rect[:] = []
+        for sprite in sprites:
+            spriteID = id(sprite)
+            if sprite.visible:
+                if drawn.has(spriteID):
+                    rect = drawn.get(spriteID)
+                    rect._x = sprite.rect._x
+                    rect._y = sprite.rect._y
+                    rect._width = sprite.rect._width
+                    rect._height = sprite.rect._height
+                else:
+                    drawn.set(spriteID, rectPool.copy(sprite.rect))
+            elif drawn.has(spriteID):
+                rectPool.append(drawn.pop(spriteID))
+            if sprite.dirty == 1:
+                sprite.dirty = 0
+        self._time_exceeded = (
+            (window.performance.now() - start) > self._time_threshold)
+        return update
+
+    def clear(self, surface, bgd):
+        """
+        Set background surface used to clear changed areas in draw.
+        """
+        self._bgd = bgd
+        return None
+
+    def repaint_rect(self, screen_rect):
+        """
+        Set area to repaint at next draw.
+        """
+        if hasattr(screen_rect, '_x'):
+            self._lost_rect.append(rectPool.copy(screen_rect))
+        else:
+            self._lost_rect.append(rectPool.get(screen_rect[0], screen_rect[1],
+                                                screen_rect[2], screen_rect[3]))
+        return None
+
+    def set_clip(self, screen_rect=None):
+        """
+        Set area to draw, None for whole surface.
+        """
+        if screen_rect is None or hasattr(screen_rect, '_x'):
+            self._clip = screen_rect
+        else:
+            self._clip = rectPool.get(screen_rect[0], screen_rect[1],
+                                      screen_rect[2], screen_rect[3])
+        return None
+
+    def get_clip(self):
+        """
+        Return area to draw.
+        """
+        return self._clip
+
+    def set_timing_threshold(self, time_ms):
+        """
+        Set draw time in ms beyond which next draw is a full redraw.
+        """
+        self._time_threshold = time_ms
+        return None
+
+    set_timing_treshold = set_timing_threshold
+
+    def set_dirty_threshold(self, fraction):
+        """
+        Set fraction of clip area changed beyond which draw is a full redraw.
+        """
+        self._dirty_threshold = fraction
+        return None
+
+    def _add_area(self, update, rect, clip):
+        area = clip.clip(rect)
+        if area._width <= 0 or area._height <= 0:
+            return
+        index = area.collidelist(update)
+        while index != -1:
+            _area = update.pop(index)
+            area.union_ip(_area)
+            rectPool.append(_area)
+            index = area.collidelist(update)
+        update.append(area)
+
+    def _draw_sprite(self, surface, sprite, area):
+        image = sprite.image
+        rect = sprite.rect
+        source = sprite.source_rect
+        if source is None:
+            sx = 0
+            sy = 0
+            w = image.width
+            h = image.height
+        elif hasattr(source, '_x'):
+            sx = source._x
+            sy = source._y
+            w = source._width
+            h = source._height
+        else:
+            sx = source[0]
+            sy = source[1]
+            w = source[2]
+            h = source[3]
+        x = rect._x
+        y = rect._y
+        x1 = x if x > area._x else area._x
+        y1 = y if y > area._y else area._y
+        x2 = min(x + w, area._x + area._width)
+        y2 = min(y + h, area._y + area._height)
+        if x2 <= x1 or y2 <= y1:
+            return
+        sx += x1 - x
+        sy += y1 - y
+        w = x2 - x1
+        h = y2 - y1
+        surface.setGlobalAlpha(image._alpha)
+        blend = sprite.blendmode
+        if blend:
+            if isinstance(blend, str):
+                surface.setGlobalCompositeOperation(blend)
+            else:
+                surface.setGlobalCompositeOperation(
+                    _blend_operation.get(blend, 'source-over'))
+        surface._ctx.drawImage(image.canvas, sx, sy, w, h, x1, y1, w, h)
+        if blend:
+            surface.setGlobalCompositeOperation('source-over')
+        surface.setGlobalAlpha(1.0)
+        surface._version += 1
+
+
+_blend_operation = {Const.BLEND_ADD: 'lighter',
+                    Const.BLEND_MULT: 'multiply',
+                    Const.BLEND_MIN: 'darken',
+                    Const.BLEND_MAX: 'lighten'}
+
+
+class SpatialGroup(Group):
+    """
+    SpatialGroup object.
+    """
+
+    # __pragma__ ('kwargs')
+
+    def __init__(self, *sprites, **kwargs):
+        """
+        Initialize SpatialGroup object.
+
+        Group subclass that index sprites in a uniform grid by rect position,
+        which collision functions use to find candidate sprites.
+        Optional argument sprites to add to group.
+        Optional cell_size keyword argument of grid cell, default to 64.
+        Sprite index is updated at group update, and sprites moved outside
+        group update are reindexed at the first query of collision functions
+        in a frame, or when passed to reindex.
+        """
+        if 'cell_size' in kwargs:
+            self._cell_size = int(kwargs['cell_size'])
+        else:
+            self._cell_size = 64
+        self._cells = IdMap()
+        self._cell_bound = IdMap()
+        self._query_mark = IdMap()
+        self._query_id = 0
+        self._validated = -1
+        Group.__init__(self, *sprites)
+
+    # __pragma__ ('nokwargs')
+
+    def copy(self):
+        """
+        Return copy of group.
+        """
+        newgroup = self.__class__(cell_size=self._cell_size)
+        newgroup.add(self.sprites())
+        return newgroup
+
+    def add(self, *sprites):
+        """
+        Add sprite(s) to group.
+        """
+        for sprite in sprites:
+            if hasattr(sprite, '_groups'):
+                spriteID = id(sprite)
+                if not self._sprites.has(spriteID):
+                    self._sprites.set(spriteID, sprite)
+                    sprite._groups.set(id(self), self)
+                    self._spritelist = None
+                    self._index(sprite, self._get_bound(sprite))
+            else:
+                self.add(*sprite)
+        return None
+
+    def remove(self, *sprites):
+        """
+        Remove sprite(s) from group.
+        """
+        for sprite in sprites:
+            if hasattr(sprite, '_groups'):
+                spriteID = id(sprite)
+                if self._sprites.has(spriteID):
+                    self._unindex(sprite)
+                    self._sprites.pop(spriteID)
+                    sprite._groups.pop(id(self))
+                    self._spritelist = None
+            else:
+                self.remove(*sprite)
+        return None
+
+    def empty(self):
+        """
+        Empty group.
+        """
+        self._cells.clear()
+        self._cell_bound.clear()
+        self._query_mark.clear()
+        Group.empty(self)
+
+    def update(self, *args):
+        """
+        Group update.
+
+        Update sprites in group by calling sprite.update,
+        then update index of sprites that moved.
+        """
+        Group.update(self, *args)
+        self.reindex()
+        return None
+
+    def reindex(self, *sprites):
+        """
+        Update index of sprite(s) that moved.
+
+        Without argument all sprites in group are checked.
+        """
+        if len(sprites) == 0:
+            sprites = self._get_sprites()
+            if env.canvas is not None:
+                self._validated = env.canvas._frame
+        for sprite in sprites:
+            if hasattr(sprite, '_groups'):
+                if self._sprites.has(id(sprite)):
+                    self._update_index(sprite)
+            else:
+                self.reindex(*sprite)
+        return None
+
+    def get_cell_size(self):
+        """
+        Return grid cell size.
+        """
+        return self._cell_size
+
+    def _validate(self):
+        """
+        Reindex sprites with rect changed since indexed, once each frame.
+        """
+        if env.canvas is not None:
+            if self._validated == env.canvas._frame:
+                return
+            self._validated = env.canvas._frame
+        for sprite in self._get_sprites():
+            self._update_index(sprite)
+
+    def _update_index(self, sprite):
+        spriteID = id(sprite)
+        if self._cell_bound.has(spriteID):
+            bound = self._cell_bound.get(spriteID)
+            rect = sprite.rect
+            if (bound[4] is rect and
+                bound[5] == rect._x and bound[6] == rect._y and
+                bound[7] == rect._width and bound[8] == rect._height):
+                return
+            _bound = self._get_bound(sprite)
+            if (_bound is not None and
+                _bound[0] == bound[0] and _bound[1] == bound[1] and
+                _bound[2] == bound[2] and _bound[3] == bound[3]):
+                self._cell_bound.set(spriteID, _bound)
+                return
+            self._unindex(sprite)
+        else:
+            _bound = self._get_bound(sprite)
+        self._index(sprite, _bound)
+
+    def _get_bound(self, sprite):
+        """
+        Return [cx1, cy1, cx2, cy2, rect, x, y, width, height] of sprite
+        cell bound and rect position when indexed.
+        """
+        if not hasattr(sprite, 'rect'):
+            return None
+        rect = sprite.rect
+        size = self._cell_size
+        x = rect._x
+        y = rect._y
+        if rect._width > 0:
+            x2 = x + rect._width - 1
+        else:
+            x2 = x
+        if rect._height > 0:
+            y2 = y + rect._height - 1
+        else:
+            y2 = y
+        return [x//size, y//size, x2//size, y2//size,
+                rect, x, y, rect._width, rect._height]
+
+    def _index(self, sprite, bound):
+        if bound is None:
+            return
+        spriteID = id(sprite)
+        cells = self._cells
+        for cy in range(bound[1], bound[3]+1):
+            for cx in range(bound[0], bound[2]+1):
+                key = _cell_key(cx, cy)
+                if not cells.has(key):
+                    cells.set(key, IdMap())
+                cells.get(key).set(spriteID, sprite)
+        self._cell_bound.set(spriteID, bound)
+        self._query_mark.set(spriteID, 0)
+
+    def _unindex(self, sprite):
+        spriteID = id(sprite)
+        if not self._cell_bound.has(spriteID):
+            return
+        bound = self._cell_bound.pop(spriteID)
+        self._query_mark.pop(spriteID)
+        cells = self._cells
+        for cy in range(bound[1], bound[3]+1):
+            for cx in range(bound[0], bound[2]+1):
+                key = _cell_key(cx, cy)
+                cell = cells.get(key)
+                cell.pop(spriteID)
+                if len(cell) == 0:
+                    cells.pop(key)
+
+    def _query(self, rect):
+        """
+        Return sprites indexed in grid cells overlapped by rect.
+
+        Call _validate before queries to reindex moved sprites.
+        """
+        if rect._width <= 0 or rect._height <= 0:
+            return []
+        size = self._cell_size
+        cx1 = rect._x // size
+        cy1 = rect._y // size
+        cx2 = (rect._x + rect._width - 1) // size
+        cy2 = (rect._y + rect._height - 1) // size
+        if (cx2-cx1+1) * (cy2-cy1+1) > len(self._sprites):
+            return self._get_sprites()
+        self._query_id += 1
+        query_id = self._query_id
+        mark = self._query_mark
+        cells = self._cells
+        sprites = []
+        for cy in range(cy1, cy2+1):
+            for cx in range(cx1, cx2+1):
+                key = _cell_key(cx, cy)
+                if not cells.has(key):
+                    continue
+                for sprite in cells.get(key).values():
+                    spriteID = id(sprite)
+                    if mark.get(spriteID) != query_id:
+                        mark.set(spriteID, query_id)
+                        sprites.append(sprite)
+        return sprites
+
+
+def _cell_key(cx, cy):
+    return ((cy + 32768) * 65536) + (cx + 32768)
 
 
 def spritecollide(sprite, group, dokill, collided=None):
@@ -720,11 +1213,17 @@ def spritecollide(sprite, group, dokill, collided=None):
     Return list of sprites in group that intersect with sprite.
     The dokill argument is a bool, True removes sprites that collide from all groups.
     An optional collided is a callback function taking two sprites and return bool collision.
+    A SpatialGroup group limits the check to sprites in grid cells of sprite rect.
     """
     collide = []
     collision = False
     rect1 = sprite.rect
-    for _sprite in group:
+    if hasattr(group, '_cells'):
+        group._validate()
+        sprites = group._query(rect1)
+    else:
+        sprites = group
+    for _sprite in sprites:
         rect2 = _sprite.rect
         if (rect1._x < (rect2._x + rect2._width) and
             rect2._x < (rect1._x + rect1._width) and
@@ -864,21 +1363,20 @@ def collide_mask(sprite1, sprite2):
 
     Check if mask of sprites intersect.
     Will use sprite mask attribute or mask generated from image attribute.
+    A generated mask is cached with the image until the image is drawn to.
+    Return first point of overlap in sprite1 mask, or None if no overlap.
     Can be used as spritecollide callback function.
     """
     if hasattr(sprite1, 'mask'):
         mask1 = sprite1.mask
     else:
-        mask1 = mask.from_surface(sprite1.image)
+        mask1 = mask._surface_mask(sprite1.image)
     if hasattr(sprite2, 'mask'):
         mask2 = sprite2.mask
     else:
-        mask2 = mask.from_surface(sprite2.image)
-    if mask1.overlap(mask2,
-        (sprite2.rect.x-sprite1.rect.x, sprite2.rect.y-sprite1.rect.y)):
-        return True
-    else:
-        return False
+        mask2 = mask._surface_mask(sprite2.image)
+    return mask._overlap(mask1, mask2,
+        (sprite2.rect.x-sprite1.rect.x, sprite2.rect.y-sprite1.rect.y))
 
 
 def groupcollide(group1, group2, dokill1, dokill2):
@@ -888,21 +1386,51 @@ def groupcollide(group1, group2, dokill1, dokill2):
     Return dictionary of sprites in group1 with list of sprites in group2 that intersect.
     Use dictionary get method to retrieve intersecting sprites for a sprite key.
     The dokill argument is a bool, True removes sprites that collide from all groups.
+    If either group is a SpatialGroup, its grid index provides candidate sprites.
     """
     collide = Dict()
     collision = False
-    for sprite1 in group1:
-        rect1 = sprite1.rect
+    if hasattr(group2, '_cells'):
+        group2._validate()
+        for sprite1 in group1:
+            rect1 = sprite1.rect
+            for sprite2 in group2._query(rect1):
+                rect2 = sprite2.rect
+                if (rect1._x < (rect2._x + rect2._width) and
+                    rect2._x < (rect1._x + rect1._width) and
+                    rect1._y < (rect2._y + rect2._height) and
+                    rect2._y < (rect1._y + rect1._height)):
+                    if sprite1 not in collide:
+                        collide.setdefault(sprite1, [])
+                    collide.get(sprite1).append(sprite2)
+                    collision = True
+    elif hasattr(group1, '_cells'):
+        group1._validate()
         for sprite2 in group2:
             rect2 = sprite2.rect
-            if (rect1._x < (rect2._x + rect2._width) and
-                rect2._x < (rect1._x + rect1._width) and
-                rect1._y < (rect2._y + rect2._height) and
-                rect2._y < (rect1._y + rect1._height)):
-                if sprite1 not in collide:
-                    collide.setdefault(sprite1, [])
-                collide.get(sprite1).append(sprite2)
-                collision = True
+            for sprite1 in group1._query(rect2):
+                rect1 = sprite1.rect
+                if (rect1._x < (rect2._x + rect2._width) and
+                    rect2._x < (rect1._x + rect1._width) and
+                    rect1._y < (rect2._y + rect2._height) and
+                    rect2._y < (rect1._y + rect1._height)):
+                    if sprite1 not in collide:
+                        collide.setdefault(sprite1, [])
+                    collide.get(sprite1).append(sprite2)
+                    collision = True
+    else:
+        for sprite1 in group1:
+            rect1 = sprite1.rect
+            for sprite2 in group2:
+                rect2 = sprite2.rect
+                if (rect1._x < (rect2._x + rect2._width) and
+                    rect2._x < (rect1._x + rect1._width) and
+                    rect1._y < (rect2._y + rect2._height) and
+                    rect2._y < (rect1._y + rect1._height)):
+                    if sprite1 not in collide:
+                        collide.setdefault(sprite1, [])
+                    collide.get(sprite1).append(sprite2)
+                    collision = True
     if collision:
         if dokill1:
             for sprite1 in collide.keys():
@@ -919,9 +1447,15 @@ def spritecollideany(sprite, group):
     Sprite collision function.
 
     Check if sprite intersect with any sprites in group.
+    A SpatialGroup group limits the check to sprites in grid cells of sprite rect.
     """
     rect1 = sprite.rect
-    for _sprite in group:
+    if hasattr(group, '_cells'):
+        group._validate()
+        sprites = group._query(rect1)
+    else:
+        sprites = group
+    for _sprite in sprites:
         rect2 = _sprite.rect
         if (rect1._x < (rect2._x + rect2._width) and
             rect2._x < (rect1._x + rect1._width) and
@@ -930,3 +1464,60 @@ def spritecollideany(sprite, group):
             return True
     return False
 
+
+class _SpriteArray:
+    """
+    Ordered sprite array.
+
+    Removal leaves a hole in the array, with the position of sprites
+    kept in an IdMap, and the array is compacted when holes accumulate
+    or when the ordered sprites are retrieved.
+    """
+
+    def __init__(self):
+        self._sprites = []
+        self._position = IdMap()
+        self._holes = 0
+
+    def __len__(self):
+        return len(self._sprites) - self._holes
+
+    def append(self, sprite):
+        self._position.set(id(sprite), len(self._sprites))
+        self._sprites.append(sprite)
+
+    def remove(self, sprite):
+        index = self._position.pop(id(sprite))
+        if index == len(self._sprites) - 1:
+            self._sprites.pop()
+        else:
+            self._sprites[index] = None
+            self._holes += 1
+            if self._holes > 32 and self._holes*2 > len(self._sprites):
+                self._compact()
+
+    def sprites(self):
+        if self._holes:
+            self._compact()
+        return self._sprites
+
+    def clear(self):
+        self._sprites = []
+        self._position.clear()
+        self._holes = 0
+
+    def copy(self):
+        array = _SpriteArray()
+        array._sprites = self._sprites[:]
+        array._position = self._position.copy()
+        array._holes = self._holes
+        return array
+
+    def _compact(self):
+        sprites = []
+        for sprite in self._sprites:
+            if sprite is not None:
+                self._position.set(id(sprite), len(sprites))
+                sprites.append(sprite)
+        self._sprites = sprites
+        self._holes = 0
@@ -9,7 +9,7 @@ The module provides surface object.
 
 from pyjsdl.pyjsobj import HTML5Canvas
 from pyjsdl.rect import Rect, rectPool
-from pyjsdl.color import Color
+from pyjsdl.color import Color, _intern
 from pyjsdl.pyjsobj import hasattr_v1 as hasattr
 from pyjsdl import env
 from pyjsdl import constants as Const
@@ -38,15 +38,14 @@ class Surface(HTML5Canvas):
         HTML5Canvas.__init__(self, self.width, self.height)
         HTML5Canvas.resize(self, self.width, self.height)
         if not (flags & Const.SRCALPHA):
-            self.setFillStyle(Color(0,0,0,255))
+            self.setFillStyle(_intern((0,0,0,255))._css)
             self.fillRect(0, 0, self.width, self.height)
         self._display = None
         self._super_surface = None
         self._offset = (0,0)
         self._colorkey = None
-        self._stroke_style = -1
-        self._fill_style = -1
         self._alpha = 1.0
+        self._mask_cache = None
         self._nonimplemented_methods()
 
     def __str__(self):
@@ -164,10 +163,11 @@ class Surface(HTML5Canvas):
             x = position.x
             y = position.y
         ctx = self._ctx
-        ctx.globalAlpha = surface._alpha
+        self._version += 1
+        self.setGlobalAlpha(surface._alpha)
         if not area:
             ctx.drawImage(surface.canvas, x, y)
-            ctx.globalAlpha = 1.0
+            self.setGlobalAlpha(1.0)
             if _return_rect:
                 rect = rectPool.get(x, y, surface.width, surface.height)
             else:
@@ -184,7 +184,7 @@ class Surface(HTML5Canvas):
                 aw = area.width
                 ah = area.height
             ctx.drawImage(surface.canvas, ax, ay, aw, ah, x, y, aw, ah)
-            ctx.globalAlpha = 1.0
+            self.setGlobalAlpha(1.0)
             if _return_rect:
                 rect = rectPool.get(x, y, aw, ah)
             else:
@@ -213,6 +213,7 @@ class Surface(HTML5Canvas):
                 surface_rect = self.get_rect()
         else:
             rects = None
+        self._version += 1
         for blit in blit_sequence:
             surface = blit[0]
             position = blit[1]
@@ -236,7 +237,7 @@ class Surface(HTML5Canvas):
                     ah = area.height
             else:
                 area = None
-            ctx.globalAlpha = surface._alpha
+            self.setGlobalAlpha(surface._alpha)
             if not area:
                 ctx.drawImage(surface.canvas, x, y)
                 if doreturn:
@@ -249,24 +250,26 @@ class Surface(HTML5Canvas):
                     rect = rectPool.get(x, y, aw, ah)
                     rects.append(surface_rect.clip(rect))
                     rectPool.append(rect)
-        ctx.globalAlpha = 1.0
+        self.setGlobalAlpha(1.0)
         return rects
 
     def _blits(self, surfaces):
         ctx = self._ctx
+        self._version += 1
         for surface, rect in surfaces:
-            ctx.globalAlpha = surface._alpha
+            self.setGlobalAlpha(surface._alpha)
             ctx.drawImage(surface.canvas, rect.x, rect.y)
-        ctx.globalAlpha = 1.0
+        self.setGlobalAlpha(1.0)
 
     def _blit_clear(self, surface, rect_list):
         ctx = self._ctx
-        ctx.globalAlpha = surface._alpha
+        self._version += 1
+        self.setGlobalAlpha(surface._alpha)
         for r in rect_list:
             ctx.drawImage(surface.canvas,
                           r.x, r.y, r.width, r.height,
                           r.x, r.y, r.width, r.height)
-        ctx.globalAlpha = 1.0
+        self.setGlobalAlpha(1.0)
 
     def clear_rect(self, rect=None):
         """
@@ -274,6 +277,7 @@ class Surface(HTML5Canvas):
 
         Optional rect to specify region to clear.
         """
+        self._version += 1
         if rect is None:
             self._ctx.clearRect(0, 0, self.width, self.height)
             if self._display:
@@ -386,15 +390,7 @@ class Surface(HTML5Canvas):
 
         The arguments represent position x,y and color of pixel.
         """
-        # __pragma__ ('opov')
-        if self._fill_style != color:
-            # __pragma__ ('noopov')
-            self._fill_style = color
-            if hasattr(color, 'a'):
-                _color = color
-            else:
-                _color = Color(color)
-            self.setFillStyle(_color)
+        self.setFillStyle(_intern(color)._css)
         self.fillRect(pos[0], pos[1], 1, 1)
         return None
 
@@ -405,14 +401,7 @@ class Surface(HTML5Canvas):
         if color is None:
             HTML5Canvas.fill(self)
             return
-        # __pragma__ ('opov')
-        if self._fill_style != color:
-            # __pragma__ ('noopov')
-            self._fill_style = color
-            if hasattr(color, 'a'):
-                self.setFillStyle(color)
-            else:
-                self.setFillStyle(Color(color))
+        self.setFillStyle(_intern(color)._css)
         if not _return_rect:
             if rect is None:
                 self.fillRect(0, 0, self.width, self.height)
@@ -497,6 +486,7 @@ class Surf:
         self._display = None
         self._colorkey = None
         self._alpha = 1.0
+        self._version = 0
         self.convert = lambda *arg: self
         self.convert_alpha = lambda *arg: self
 
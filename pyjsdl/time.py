@@ -7,6 +7,7 @@
 The module provides time monitoring functionality.
 """
 
+from math import ceil as _ceil, floor as _floor
 from pyjsdl import env
 from pyjsdl.pyjsobj import performanceNowInit
 
@@ -17,6 +18,7 @@ class Clock:
     """
 
     _wnd = None
+    _log = None
 
     def __init__(self):
         """
@@ -49,6 +51,8 @@ class Clock:
         self._time = self._wnd.performance.now()
         self._time_diff = self._time - self._time_init
         self._time_init = self._time
+        if Clock._log is not None:
+            self._time_diff = Clock._log.tick(self._time_diff)
         return self._time_diff
 
     def tick_busy_loop(self, framerate=0):
@@ -93,6 +97,7 @@ class Time:
         self._time_init = self.time()
         self._framerate = 0
         self._timers = {}
+        self._wheel = _wheel
         self.run = lambda: self.wait()
 
     def get_ticks(self):
@@ -110,6 +115,8 @@ class Time:
         Pause for given time (in ms). Return ms paused.
         Suspends the program, preferably use time.wait.
         """
+        if Clock._log is not None and Clock._log._replay:
+            return time
         start = self._wnd.performance.now()
         while True:
             if self._wnd.performance.now() - start > time:
@@ -214,25 +221,228 @@ class _EventTimer:
         self.repeat = True
 
     def set_timer(self, time, repeat):
-        if self.timer:
-            self.repeat = False
-            self.clear_timeout()
+        if self.timer is not None:
+            _wheel.cancel(self.timer)
+            self.timer = None
         if time:
             self.time = time
             self.repeat = repeat
-            self.set_timeout()
-
-    def set_timeout(self):
-        run = lambda: self.run()
-        timer = window.setTimeout(run, self.time)
-        self.timer = timer
-
-    def clear_timeout(self):
-        window.clearTimeout(self.timer)
-        self.timer = None
+            if repeat:
+                self.timer = _wheel.schedule(self.run, time, time)
+            else:
+                self.timer = _wheel.schedule(self.run, time)
 
     def run(self):
+        if not self.repeat:
+            self.timer = None
         env.event.post(self.event)
-        if self.repeat:
-            self.set_timeout()
 
+
+class _Timer:
+
+    def __init__(self, id, callback, time, period):
+        self.id = id
+        self.callback = callback
+        self.time = time
+        self.period = period
+        self.expire = 0
+        self.level = 0
+        self.slot = None
+        self.active = True
+
+
+class _TimerWheel:
+    """
+    Hierarchical timer wheel.
+
+    Timers are placed in levels of 64 slots, level 0 slots of resolution ms
+    and each level up 64 times wider, cascading to lower levels as the
+    wheel turns. Each slot is a Map of timer id, for O(1) insert and cancel.
+    The wheel is advanced by the display frame hook and by a single
+    fallback timeout armed for the next due slot.
+    Periodic timers are rescheduled from due time, to not accumulate drift.
+    """
+
+    def __init__(self, resolution=4.0):
+        self.resolution = resolution
+        self.levels = 4
+        self.spans = [1, 64, 4096, 262144]
+        self.wheel = None
+        self.timers = None
+        self.counts = [0, 0, 0, 0]
+        self.tick = 0
+        self.time0 = 0.0
+        self.id = 0
+        self.fallback = None
+        self.fallback_tick = -1
+        self.canvas = None
+        self.hook = None
+
+    def _init(self):
+        self.wheel = [[__new__(Map()) for i in range(64)]
+                      for level in range(self.levels)]
+        self.timers = __new__(Map())
+        self.time0 = window.performance.now()
+
+    def schedule(self, callback, time, period=0):
+        """
+        Schedule callback in time ms, repeated at period ms if set.
+
+        Return timer id.
+        """
+        if self.timers is None:
+            self._init()
+        now = window.performance.now()
+        if not self.timers.size:
+            self.tick = max(self.tick, self._current(now))
+        if env.canvas is not None and env.canvas is not self.canvas:
+            self._hook(env.canvas)
+        self.id += 1
+        timer = _Timer(self.id, callback, now + time, period)
+        timer.expire = max(self._expire(timer.time), self.tick + 1)
+        self.timers.set(timer.id, timer)
+        self._insert(timer)
+        self._arm(now)
+        return timer.id
+
+    def _hook(self, canvas):
+        #register frame hook with canvas, again when display mode is reset
+        if self.hook is None:
+            self.hook = self.advance
+        if self.hook not in canvas._frame_hooks:
+            canvas._frame_hooks.append(self.hook)
+        self.canvas = canvas
+
+    def cancel(self, id):
+        """
+        Cancel timer of id.
+        """
+        if self.timers is None or not self.timers.has(id):
+            return None
+        timer = self.timers.js_get(id)
+        self.timers.delete(id)
+        timer.active = False
+        if timer.slot is not None:
+            timer.slot.delete(id)
+            self.counts[timer.level] -= 1
+            timer.slot = None
+        return None
+
+    def advance(self, now=None):
+        """
+        Advance wheel to time now, running due timers.
+        """
+        if self.timers is None:
+            return None
+        if now is None:
+            now = window.performance.now()
+        target = self._current(now)
+        spans = self.spans
+        while self.tick < target:
+            if not self.timers.size:
+                self.tick = target
+                break
+            if not self.counts[0]:
+                boundary = (_floor(self.tick / 64) + 1) * 64 - 1
+                if boundary > self.tick:
+                    self.tick = min(boundary, target)
+                    continue
+            self.tick += 1
+            tick = self.tick
+            level = 1
+            while level < self.levels and not tick % spans[level]:
+                self._cascade(level, _floor(tick / spans[level]) % 64)
+                level += 1
+            slot = self.wheel[0][tick % 64]
+            if slot.size:
+                self._run(slot, now)
+        self._arm(now)
+        return None
+
+    def _current(self, now):
+        return _floor((now - self.time0) / self.resolution)
+
+    def _expire(self, time):
+        return _ceil((time - self.time0) / self.resolution)
+
+    def _insert(self, timer):
+        if timer.expire < self.tick:
+            timer.expire = self.tick
+        delta = timer.expire - self.tick
+        slot_tick = timer.expire
+        level = 0
+        while level < self.levels - 1 and delta >= self.spans[level+1]:
+            level += 1
+        if level == self.levels - 1 and delta >= self.spans[level] * 64:
+            slot_tick = self.tick + self.spans[level] * 64 - 1
+        index = _floor(slot_tick / self.spans[level]) % 64
+        slot = self.wheel[level][index]
+        slot.set(timer.id, timer)
+        timer.slot = slot
+        timer.level = level
+        self.counts[level] += 1
+
+    def _collect(self, slot, level):
+        timers = []
+        slot.forEach(lambda timer, id: timers.append(timer))
+        slot.js_clear()
+        self.counts[level] -= len(timers)
+        for timer in timers:
+            timer.slot = None
+        return timers
+
+    def _cascade(self, level, index):
+        slot = self.wheel[level][index]
+        if slot.size:
+            for timer in self._collect(slot, level):
+                self._insert(timer)
+
+    def _run(self, slot, now):
+        for timer in self._collect(slot, 0):
+            if not timer.active:
+                continue
+            if timer.period:
+                time = timer.time + timer.period
+                if time <= now:
+                    missed = _floor((now - time) / timer.period) + 1
+                    time += missed * timer.period
+                timer.time = time
+                timer.expire = max(self._expire(time), self.tick + 1)
+                self._insert(timer)
+            else:
+                timer.active = False
+                self.timers.delete(timer.id)
+            timer.callback()
+
+    def _arm(self, now):
+        if not self.timers.size:
+            if self.fallback is not None:
+                window.clearTimeout(self.fallback)
+                self.fallback = None
+                self.fallback_tick = -1
+            return
+        tick = self._next_tick()
+        if tick == self.fallback_tick:
+            return
+        if self.fallback is not None:
+            window.clearTimeout(self.fallback)
+        self.fallback_tick = tick
+        delay = max(0, self.time0 + tick * self.resolution - now)
+        self.fallback = window.setTimeout(self._fallback_run, delay)
+
+    def _fallback_run(self):
+        self.fallback = None
+        self.fallback_tick = -1
+        self.advance()
+
+    def _next_tick(self):
+        boundary = (_floor(self.tick / 64) + 1) * 64
+        if self.counts[0]:
+            slots = self.wheel[0]
+            for tick in range(self.tick + 1, boundary):
+                if slots[tick % 64].size:
+                    return tick
+        return boundary
+
+
+_wheel = _TimerWheel()
@@ -8,9 +8,12 @@ The module provides surface transformation functionality.
 """
 
 from math import pi as _pi, sin as _sin, cos as _cos, ceil as _ceil
+from math import floor as _floor
 from pyjsdl.pyjsobj import fabs as _fabs
 from pyjsdl.pylib import int
 from pyjsdl.surface import Surface
+from pyjsdl.rect import Rect
+from pyjsdl.util import LRUCache
 from pyjsdl import constants as Const
 
 
@@ -21,6 +24,19 @@ def rotate(surface, angle):
     """
     Return Surface rotated by the given angle.
     """
+    if _cache.enabled and hasattr(surface, '_id'):
+        angle = _cache.quantize(angle, _cache.angle_step)
+        key = _cache.key(surface, 'rotate', angle, 0)
+        surf = _cache.get(key, surface)
+        if surf is not None:
+            return surf
+        surf = _rotate(surface, angle)
+        _cache.set(key, surf)
+        return surf
+    return _rotate(surface, angle)
+
+
+def _rotate(surface, angle):
     if not angle:
         return surface.copy()
     theta = angle * _deg_rad
@@ -45,6 +61,19 @@ def rotozoom(surface, angle, size):
     """
     Return Surface rotated and resized by the given angle and size.
     """
+    if _cache.enabled and hasattr(surface, '_id'):
+        angle = _cache.quantize(angle, _cache.angle_step)
+        key = _cache.key(surface, 'rotozoom', angle, size)
+        surf = _cache.get(key, surface)
+        if surf is not None:
+            return surf
+        surf = _rotozoom(surface, angle, size)
+        _cache.set(key, surf)
+        return surf
+    return _rotozoom(surface, angle, size)
+
+
+def _rotozoom(surface, angle, size):
     if not angle:
         width = int(surface.width * size)
         height = int(surface.height * size)
@@ -79,6 +108,18 @@ def scale(surface, size, dest=None):
 
     An optional destination surface can be provided.
     """
+    if _cache.enabled and not dest and hasattr(surface, '_id'):
+        key = _cache.key(surface, 'scale', size[0], size[1])
+        surf = _cache.get(key, surface)
+        if surf is not None:
+            return surf
+        surf = _scale(surface, size, None)
+        _cache.set(key, surf)
+        return surf
+    return _scale(surface, size, dest)
+
+
+def _scale(surface, size, dest):
     if not dest:
         surf = Surface(size, Const.SRCALPHA)
     else:
@@ -116,6 +157,98 @@ def flip(surface, xbool=True, ybool=False):
     """
     Return Surface that is flipped horizontally, vertically, or both.
     """
+    if _cache.enabled and hasattr(surface, '_id'):
+        key = _cache.key(surface, 'flip', bool(xbool), bool(ybool))
+        surf = _cache.get(key, surface)
+        if surf is not None:
+            return surf
+        surf = _flip(surface, xbool, ybool)
+        _cache.set(key, surf)
+        return surf
+    return _flip(surface, xbool, ybool)
+
+
+def cached_rotate(surface, angle, angle_step=None):
+    """
+    Return Surface rotated by the given angle, retrieved from transform cache.
+
+    The angle is quantized to angle_step degrees, which defaults to the
+    cache angle step, and the transform cache is used even if not enabled.
+    """
+    if angle_step is None:
+        angle_step = _cache.angle_step
+    angle = _cache.quantize(angle, angle_step)
+    if not hasattr(surface, '_id'):
+        return _rotate(surface, angle)
+    key = _cache.key(surface, 'rotate', angle, 0)
+    surf = _cache.get(key, surface)
+    if surf is not None:
+        return surf
+    surf = _rotate(surface, angle)
+    _cache.set(key, surf)
+    return surf
+
+
+def set_cache(enable=True, budget=None, angle_step=None):
+    """
+    Set transform cache.
+
+    Argument enable for rotate, rotozoom, scale and flip to return surfaces
+    from cache, keyed by source surface and its changes, operation and
+    parameters with angle quantized to angle_step degrees (default 1.0).
+    Optional budget of cached surfaces in bytes (default 32MB), beyond
+    which least recently used surfaces are discarded.
+    Cached surfaces are shared, and are regenerated if drawn on.
+    """
+    _cache.enabled = enable
+    if budget is not None:
+        _cache.budget = budget
+        _cache.evict()
+    if angle_step is not None:
+        _cache.angle_step = angle_step
+    return None
+
+
+def get_cache_stats():
+    """
+    Return transform cache statistics.
+
+    Return dict with hits, misses, bytes and entries of cache.
+    """
+    return {'hits': _cache.hits,
+            'misses': _cache.misses,
+            'bytes': _cache.size,
+            'entries': _cache.entries.size}
+
+
+def clear_cache():
+    """
+    Clear transform cache and statistics.
+    """
+    _cache.clear()
+    return None
+
+
+def rotation_sheet(surface, steps, per_frame=0):
+    """
+    Return RotationSheet of surface rotations.
+
+    Argument steps is the number of rotations evenly spaced over 360 degrees,
+    pre-rendered into a single sheet surface.
+    Optional per_frame to render the rotations over animation frames,
+    that number each frame, rather than all at once.
+    """
+    sheet = RotationSheet(surface, steps)
+    if per_frame:
+        sheet._schedule(per_frame)
+    else:
+        sheet.bake()
+    return sheet
+
+# __pragma__ ('nokwargs')
+
+
+def _flip(surface, xbool, ybool):
     surf = Surface((surface.width, surface.height), Const.SRCALPHA)
     surf.saveContext()
     if xbool and ybool:
@@ -133,5 +266,177 @@ def flip(surface, xbool=True, ybool=False):
     surf._alpha = surface._alpha
     return surf
 
-# __pragma__ ('nokwargs')
+
+class RotationSheet:
+    """
+    RotationSheet object.
+    """
+
+    def __init__(self, surface, steps):
+        """
+        Initialize RotationSheet object.
+
+        Rotations of surface at steps evenly spaced angles, in cells of
+        a sheet surface with area of each rotation sized as by rotate.
+        Use transform.rotation_sheet to create and render the sheet.
+        """
+        self._source = surface
+        self.steps = int(steps)
+        self._step = 360.0 / self.steps
+        self._areas = []
+        self._baked = [False for i in range(self.steps)]
+        self._pending = self.steps
+        self._per_frame = 0
+        width_i = surface.width
+        height_i = surface.height
+        cell_width = 0
+        cell_height = 0
+        for i in range(self.steps):
+            theta = i * self._step * _deg_rad
+            cos_theta = _fabs(_cos(theta))
+            sin_theta = _fabs(_sin(theta))
+            width_f = int((width_i * cos_theta) + (height_i * sin_theta))
+            height_f = int((width_i * sin_theta) + (height_i * cos_theta))
+            self._areas.append(Rect(0, 0, width_f, height_f))
+            cell_width = max(cell_width, width_f)
+            cell_height = max(cell_height, height_f)
+        cell_width += 2
+        cell_height += 2
+        columns = int(_ceil(self.steps ** 0.5))
+        rows = int(_ceil(self.steps / columns))
+        for i in range(self.steps):
+            self._areas[i].x = (i % columns) * cell_width
+            self._areas[i].y = (i // columns) * cell_height
+        self.surface = Surface((columns*cell_width, rows*cell_height),
+                               Const.SRCALPHA)
+        self.surface._colorkey = surface._colorkey
+        self.surface._alpha = surface._alpha
+
+    def __str__(self):
+        s = '<{}({} steps)>'
+        return s.format(self.__class__.__name__, self.steps)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_index(self, angle):
+        """
+        Return index of rotation nearest to angle.
+        """
+        index = int(round(angle / self._step)) % self.steps
+        if index < 0:
+            index += self.steps
+        return index
+
+    def get_angle(self, index):
+        """
+        Return angle of rotation at index.
+        """
+        return index * self._step
+
+    def get(self, angle):
+        """
+        Return (surface, area) of rotation nearest to angle.
+
+        The sheet surface and area are used as surface.blit(sheet, position, area).
+        """
+        index = self.get_index(angle)
+        if not self._baked[index]:
+            self._render(index)
+        return (self.surface, self._areas[index])
+
+    def draw(self, surface, angle, position):
+        """
+        Draw rotation nearest to angle on surface at position.
+        """
+        index = self.get_index(angle)
+        if not self._baked[index]:
+            self._render(index)
+        return surface.blit(self.surface, position, self._areas[index])
+
+    def bake(self, count=None):
+        """
+        Render pending rotations.
+
+        Optional count of rotations to render, defaults to all.
+        Return True when all rotations are rendered.
+        """
+        index = 0
+        while self._pending and count != 0:
+            while self._baked[index]:
+                index += 1
+            self._render(index)
+            if count is not None:
+                count -= 1
+        return not self._pending
+
+    def is_baked(self):
+        """
+        Check if all rotations are rendered.
+        """
+        return not self._pending
+
+    def _render(self, index):
+        area = self._areas[index]
+        surface = self._source
+        theta = index * self._step * _deg_rad
+        self.surface.saveContext()
+        self.surface.translate(area.x + area.width/2.0,
+                               area.y + area.height/2.0)
+        self.surface.rotate(-theta)
+        self.surface.drawImage(surface.canvas,
+                               -surface.width/2, -surface.height/2)
+        self.surface.restoreContext()
+        self._baked[index] = True
+        self._pending -= 1
+
+    def _schedule(self, per_frame):
+        self._per_frame = per_frame
+        window.requestAnimationFrame(self._bake_frame)
+
+    def _bake_frame(self, timestamp):
+        if not self.bake(self._per_frame):
+            window.requestAnimationFrame(self._bake_frame)
+
+    def toString(self):
+        return self.__str__()
+
+
+class _TransformCache(LRUCache):
+    """
+    Transform cache.
+
+    LRUCache of transformed surfaces within budget bytes, keyed by source
+    surface id and version, operation and parameters.
+    """
+
+    def __init__(self, budget):
+        LRUCache.__init__(self, budget, False)
+        self.angle_step = 1.0
+
+    def quantize(self, angle, step):
+        angle = angle - 360.0 * _floor(angle / 360.0)
+        if step:
+            angle = round(angle / step) * step
+            if angle >= 360.0:
+                angle -= 360.0
+        return angle
+
+    def key(self, surface, operation, param1, param2):
+        return '{}:{}:{}:{}:{}'.format(surface._id, surface._version,
+                                       operation, param1, param2)
+
+    def get(self, key, surface):
+        surf = LRUCache.get(self, key)
+        if surf is not None:
+            surf._colorkey = surface._colorkey
+            surf._alpha = surface._alpha
+        return surf
+
+    def set(self, key, surf):
+        LRUCache.set(self, key, surf, surf.width * surf.height * 4,
+                     surf._version)
+
+
+_cache = _TransformCache(32*1024*1024)
 
@@ -242,3 +242,177 @@ class Dict:
     def toString(self):
         return self.__str__()
 
+
+
+class IdMap:
+    """
+    Identity map object.
+
+    IdMap stores values by integer key in a JavaScript Map,
+    avoiding the str key conversion of a Transcrypt dict.
+    Used with object _identity keys for sprite and group membership.
+    """
+
+    def __init__(self, idmap=None):
+        if idmap is None:
+            self._map = __new__(Map())
+        else:
+            self._map = __new__(Map(idmap._map))
+
+    def __str__(self):
+        s = ['{}: {}'.format(k,v) for k,v in self.items()]
+        return '{' + ', '.join(s) + '}'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self):
+        return self._map.size
+
+    def __contains__(self, key):
+        return self._map.has(key)
+
+    def has(self, key):
+        """
+        Check if key in map.
+        """
+        return self._map.has(key)
+
+    def get(self, key):
+        """
+        Get value of key.
+        """
+        return self._map.js_get(key)
+
+    def set(self, key, val):
+        """
+        Set value of key.
+        """
+        self._map.set(key, val)
+
+    def pop(self, key):
+        """
+        Remove key and return its value.
+        """
+        val = self._map.js_get(key)
+        self._map.delete(key)
+        return val
+
+    def clear(self):
+        """
+        Remove all keys.
+        """
+        self._map.js_clear()
+
+    def copy(self):
+        """
+        Return copy of map.
+        """
+        return IdMap(self)
+
+    def keys(self):
+        """
+        Retrieve keys.
+        """
+        keys = []
+        self._map.forEach(lambda val, key: keys.append(key))
+        return keys
+
+    def values(self):
+        """
+        Retrieve values.
+        """
+        values = []
+        self._map.forEach(lambda val, key: values.append(val))
+        return values
+
+    def items(self):
+        """
+        Retrieve key, value items.
+        """
+        items = []
+        self._map.forEach(lambda val, key: items.append((key, val)))
+        return items
+
+    def toString(self):
+        return self.__str__()
+
+
+class LRUCache:
+    """
+    Least recently used cache object.
+
+    LRUCache stores values by key in a JavaScript Map in order of use,
+    each entry with a size, and evicts least recently used entries when
+    the summed size exceeds budget. A value stored with a version is
+    invalidated when its _version attribute changes.
+    """
+
+    def __init__(self, budget, enabled=True):
+        self.enabled = enabled
+        self.budget = budget
+        self.entries = __new__(Map())
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self.entries.size
+
+    def get(self, key):
+        """
+        Return value of key, or None if absent or invalidated.
+        """
+        if not self.entries.has(key):
+            self.misses += 1
+            return None
+        entry = self.entries.js_get(key)
+        self.entries.delete(key)
+        if entry[1] is not None and entry[0]._version != entry[1]:
+            self.size -= entry[2]
+            self.misses += 1
+            return None
+        self.entries.set(key, entry)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, size=1, version=None):
+        """
+        Store value of key with size and optional version.
+        """
+        if size > self.budget:
+            return
+        if self.entries.has(key):
+            self.size -= self.entries.js_get(key)[2]
+            self.entries.delete(key)
+        self.entries.set(key, [value, version, size])
+        self.size += size
+        self.evict()
+
+    def evict(self):
+        """
+        Evict least recently used entries beyond budget.
+        """
+        while self.size > self.budget and self.entries.size:
+            key = self.entries.js_keys().js_next().value
+            self.size -= self.entries.js_get(key)[2]
+            self.entries.delete(key)
+
+    def hit_rate(self):
+        """
+        Return fraction of lookups that were hits.
+        """
+        lookups = self.hits + self.misses
+        if lookups:
+            return self.hits / lookups
+        else:
+            return 0.0
+
+    def clear(self):
+        """
+        Remove all entries and reset statistics.
+        """
+        self.entries.js_clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
@@ -16,7 +16,8 @@ def init(environ):
              test_color_comparison,
              test_color_operator,
              test_color_transform,
-             test_color_conversion]
+             test_color_conversion,
+             test_color_intern]
     return tests
 
 
@@ -284,3 +285,21 @@ def test_color_conversion():
     assert (_rd( h, s, l, a )) == (10.0, 19.737, 29.804, 40.0)
     assert c == (91, 66, 61, 102)
 
+
+def test_color_intern():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    color = pg.color
+    c1 = color._intern((10,20,30))
+    assert c1 is color._intern(pg.Color(10,20,30))
+    assert c1 is color._intern([10,20,30,255])
+    assert c1._css == str(pg.Color(10,20,30))
+    c2 = color._intern((10,20,30,128))
+    assert c2 is not c1
+    assert c2 == (10,20,30,128)
+    for i in range(color._cache_size):
+        color._intern((i, 0, 173, 254))
+    assert color._cache.size == color._cache_size
+    c3 = color._intern((10,20,30))
+    assert c3 is not c1
+    assert c3 == c1
@@ -0,0 +1,73 @@
+env = None
+pg = None
+
+
+def init(environ):
+    global env, pg
+    env = environ
+    pg = env['pg']
+    tests = [test_display_update_coalesce,
+             test_display_direct]
+    return tests
+
+
+def test_display_update_coalesce():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    canvas = pg.display.get_canvas()
+    canvas.render()
+    pg.display.set_update_coverage(0.75)
+    pg.display.update([pg.Rect(0,0,4,4), pg.Rect(4,0,4,4), pg.Rect(1,1,2,2)])
+    assert canvas._coalesce() == 32 / 400
+    assert canvas._rect_num == 1
+    rect = canvas._rect_list[0]
+    assert (rect.x, rect.y, rect.width, rect.height) == (0,0,8,4)    # __:opov
+    canvas._rect_num = 0
+    saved = pg.display.get_update_saved()
+    pg.display.update([pg.Rect(0,0,4,4), pg.Rect(4,0,4,4), pg.Rect(1,1,2,2)])
+    canvas.render()
+    assert pg.display.get_update_saved() == saved + 2
+    pg.display.update([pg.Rect(0,0,18,18), pg.Rect(19,19,1,1)])
+    assert canvas._coalesce() > 0.75
+    assert canvas._rect_num == 2
+    canvas.render()
+    assert pg.display.get_update_saved() == saved + 3
+    pg.display.update([pg.Rect(2*(i%10), 2*(i//10), 1, 1) for i in range(70)])
+    assert canvas._coalesce() == (19*13) / 400
+    assert canvas._rect_num == 1
+    canvas.render()
+    assert canvas._rect_num == 0
+
+
+def test_display_direct():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    canvas = pg.display.get_canvas()
+    size = pg.display.get_surface().get_size()
+    calls = []
+    hook = lambda: calls.append(1)
+    canvas._frame_hooks.append(hook)
+    surface = pg.display.set_mode(size, direct=True)
+    direct = pg.display.get_canvas()
+    assert direct is not canvas and surface is pg.display.get_surface()
+    assert surface is not direct and surface.canvas is direct.canvas
+    image = pg.Surface((4,4))
+    image.fill((255,0,0))
+    surface.fill((0,0,255))
+    surface.blit(image, (2,2))
+    pg.display.flip()
+    pg.display.update(pg.Rect(0,0,4,4))
+    assert direct._rect_num == 0
+    assert direct.get_at((3,3)) == (255,0,0,255)    # __:opov
+    assert direct.get_at((8,8)) == (0,0,255,255)    # __:opov
+    assert hook in direct._frame_hooks
+    frame = direct._frame
+    callback = direct.callback
+    direct.set_callback(lambda: None)
+    direct._run()
+    direct.callback = callback
+    assert calls == [1] and direct._frame == frame + 1    # __:opov
+    direct._frame_hooks.remove(hook)
+    surface = pg.display.set_mode(size)
+    assert surface is not pg.display.get_canvas()
+    assert pg.display.get_canvas()._frame_hooks is direct._frame_hooks
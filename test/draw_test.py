@@ -14,7 +14,9 @@ def init(environ):
              test_draw_arc,
              test_draw_polygon,
              test_draw_line,
-             test_draw_lines]
+             test_draw_lines,
+             test_draw_batch,
+             test_draw_path_cache]
     return tests
 
 
@@ -116,3 +118,59 @@ def test_draw_lines():
         assert c == pos[1]
     assert (rect.x,rect.y,rect.width,rect.height) == data[1]    # __:opov
 
+
+
+def test_draw_batch():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    surface.fill((0,0,0))
+    rect = pg.draw.rects(surface, [(255,0,0),(0,255,0)], [5,8,10,5, 30,8,5,5])
+    assert surface.get_at((10,10)).r == 255 and surface.get_at((32,10)).g == 255
+    assert (rect.x,rect.y,rect.width,rect.height) == (5,8,30,5)    # __:opov
+    surface.fill((0,0,0))
+    rect = pg.draw.circles(surface, (255,0,0), [10,10,5, 30,10,5])
+    assert surface.get_at((10,10)).r == 255 and surface.get_at((30,10)).r == 255
+    assert surface.get_at((20,10)).r == 0
+    assert (rect.x,rect.y,rect.width,rect.height) == (5,5,30,10)    # __:opov
+    surface.fill((0,0,0))
+    rect = pg.draw.points(surface, (255,0,0), [5,8, 15,8])
+    assert surface.get_at((5,8)).r == 255 and surface.get_at((10,8)).r == 0
+    assert (rect.x,rect.y,rect.width,rect.height) == (5,8,11,1)    # __:opov
+
+
+def test_draw_path_cache():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    pg.draw.set_path_cache(True)
+    for offset in (0, 20):
+        surface.fill((0,0,0))
+        rect = pg.draw.polygon(surface, (255,0,0),
+            ((10+offset,5),(15+offset,15),(5+offset,15)))
+        assert surface.get_at((10+offset,4)).r == 0
+        assert surface.get_at((10+offset,8)).r == 255
+        assert (rect.x,rect.y,rect.width,rect.height) == (5+offset,5,11,11)    # __:opov
+    surface.fill((0,0,0))
+    rect = pg.draw.ellipse(surface, (255,0,0), (5,5,20,10))
+    assert surface.get_at((15,10)).r == 255 and surface.get_at((6,6)).r == 0
+    assert (rect.x,rect.y,rect.width,rect.height) == (5,5,20,10)    # __:opov
+    surface.fill((0,0,0))
+    pg.draw.polygon(surface, (255,0,0), ((10,5),(5,15),(15,15)))
+    assert surface.get_at((10,4)).r == 0 and surface.get_at((10,8)).r == 255
+    pixels = []
+    for setting in (False, True):
+        pg.draw.set_path_cache(setting)
+        surface.fill((0,0,0))
+        pg.draw.ellipse(surface, (255,0,0), (5,5,21,11))
+        pixels.append([surface.get_at((x,10)).r for x in range(3,29)])
+    assert pixels[0] == pixels[1]    # __:opov
+    cache = pg.draw._path_cache
+    misses = cache.misses
+    pg.draw.arc(surface, (255,0,0), (5,5,21,11), 0, 3.1416, 1)
+    pg.draw.arc(surface, (255,0,0), (5,5,21,11), 0, 3.1416, 0)
+    pg.draw.arc(surface, (255,0,0), (5,5,21,11), 0, 1.5708, 0)
+    assert cache.misses == misses + 3
+    pg.draw.ellipse(surface, (255,0,0), (5,5,21,11))
+    pg.draw.arc(surface, (255,0,0), (5,5,21,11), 0, 3.1416, 2)
+    assert cache.misses == misses + 3
+    assert surface._ctx.getTransform().e == 0
+    pg.draw.set_path_cache(False)
@@ -12,7 +12,12 @@ def init(environ):
              test_event_peek,
              test_event_clear,
              test_event_block,
-             test_event_post]
+             test_event_post,
+             test_event_overflow,
+             test_event_queue,
+             test_event_coalesce,
+             test_event_pooling,
+             test_event_replay]
     return tests
 
 
@@ -143,3 +148,197 @@ def test_event_post():
     e = [ev for ev in evts if ev.type==pg.USEREVENT][0]
     assert (e.type==pg.USEREVENT and e.x==1 and e.y==2 and e.z==3)
 
+
+
+def test_event_overflow():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    events = [pg.KEYDOWN, pg.MOUSEBUTTONDOWN, pg.USEREVENT]
+    event_obj = {}
+    for evt in events:
+        event_obj[evt] = pg.event.Event(evt)
+    pg.event.clear()
+    dropped = pg.event.get_dropped()
+    pg.event.set_overflow('drop_oldest', 2)
+    for evt in events:
+        pg.event.post(event_obj[evt])
+    assert pg.event.get_dropped() == dropped + 1
+    evts = pg.event.get()
+    assert [e.type for e in evts] == events[1:]    # __:opov
+    pg.event.set_overflow('drop_newest')
+    for evt in events:
+        pg.event.post(event_obj[evt])
+    assert pg.event.get_dropped() == dropped + 2
+    evts = pg.event.get()
+    assert [e.type for e in evts] == events[:2]    # __:opov
+    pg.event.set_overflow('grow')
+    for evt in events:
+        pg.event.post(event_obj[evt])
+    assert pg.event.get_overflow() == ('grow', 4)    # __:opov
+    evts = pg.event.get()
+    assert [e.type for e in evts] == events    # __:opov
+    pg.event.set_overflow('drop_oldest', 256)
+
+
+def test_event_queue():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    events = [pg.KEYDOWN, pg.MOUSEBUTTONDOWN, pg.USEREVENT]
+    pg.event.clear()
+    dropped = pg.event.get_dropped()
+    pg.event.set_overflow('drop_oldest', 4)
+    for i in range(5):
+        for j in range(3):
+            pg.event.post(pg.event.Event(events[j], {'n':i*3+j}))
+        evts = pg.event.get()
+        assert [e.n for e in evts] == [i*3, i*3+1, i*3+2]    # __:opov
+    for i in range(6):
+        pg.event.post(pg.event.Event(events[i%3], {'n':i}))
+    assert pg.event.get_dropped() == dropped + 2
+    evts = pg.event.get(events[0])
+    assert [e.n for e in evts] == [3]    # __:opov
+    for i in range(6, 8):
+        pg.event.post(pg.event.Event(events[i%3], {'n':i}))
+    assert pg.event.get_dropped() == dropped + 3
+    evts = pg.event.get()
+    assert [e.n for e in evts] == [4, 5, 6, 7]    # __:opov
+    pg.event.set_overflow('drop_newest')
+    for i in range(6):
+        pg.event.post(pg.event.Event(events[i%3], {'n':i}))
+    assert pg.event.get_dropped() == dropped + 5
+    evts = pg.event.get([events[1], events[2]])
+    assert [e.n for e in evts] == [1, 2]    # __:opov
+    pg.event.post(pg.event.Event(events[1], {'n':6}))
+    evts = pg.event.get()
+    assert [e.n for e in evts] == [0, 3, 6]    # __:opov
+    pg.event.set_overflow('grow')
+    for i in range(3):
+        pg.event.post(pg.event.Event(events[i%3], {'n':i}))
+    assert pg.event.poll().n == 0
+    for i in range(3, 10):
+        pg.event.post(pg.event.Event(events[i%3], {'n':i}))
+    assert pg.event.get_overflow() == ('grow', 16)    # __:opov
+    assert pg.event.get_dropped() == dropped + 5
+    evts = pg.event.get(events[0])
+    assert [e.n for e in evts] == [3, 6, 9]    # __:opov
+    evts = pg.event.get()
+    assert [e.n for e in evts] == [1, 2, 4, 5, 7, 8]    # __:opov
+    pg.event.set_overflow('drop_oldest', 256)
+
+
+def test_event_coalesce():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    canvas = pg.env.canvas
+    mouse_pos = pg.event.mouseEvt['pos']
+    pg.event.set_coalesce(pg.MOUSEMOTION)
+    for pooling in (False, True):
+        pg.event.set_pooling(pooling)
+        pg.event.clear()
+        pg.event.mouseEvt['pos'] = _mouse_event(10, 10, 0)
+        for x, y, buttons in ((12,11,0), (15,13,0), (20,20,0),
+                              (21,20,1), (23,21,1)):
+            canvas.onMouseMove(_mouse_event(x, y, buttons))
+        evts = pg.event.get()
+        assert len(evts) == 2
+        assert evts[0].rel == (10,10) and not evts[0].buttons[0]    # __:opov
+        assert evts[1].rel == (3,1) and evts[1].buttons[0]    # __:opov
+    pg.event.set_pooling(False)
+    pg.event.set_coalesce(pg.MOUSEMOTION, False)
+    pg.event.mouseEvt['pos'] = mouse_pos
+    callback = _TouchCallback()
+    pg.event.touchlistener.add_callback(callback)
+    pg.event.set_coalesce('touchmove')
+    canvas.onTouchStart(_touch_event('touchstart', 0, 5, 5))
+    for x in (6, 8, 11):
+        canvas.onTouchMove(_touch_event('touchmove', 0, x, 7))
+    assert len(callback.moves) == 0
+    canvas.onTouchEnd(_touch_event('touchend', 0, 11, 7))
+    assert len(callback.moves) == 1
+    assert callback.moves[0].rel[0] == (6,2)    # __:opov
+    pg.event.set_coalesce('touchmove', False)
+    pg.event.touchlistener.callback.remove(callback)
+
+
+def test_event_pooling():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    canvas = pg.env.canvas
+    mouse_pos = pg.event.mouseEvt['pos']
+    keydown = pg.event.eventObj['keydown']
+    pg.event.set_pooling(True)
+    assert pg.event.eventObj['keydown'] is not keydown
+    pg.event.clear()
+    pg.event.mouseEvt['pos'] = _mouse_event(10, 10, 0)
+    evts = []
+    for x in (12, 15, 20):
+        canvas.onMouseMove(_mouse_event(x, 10, 0))
+        evts.append(pg.event.get()[0])
+    left = canvas._clientRect.left
+    assert [e.pos[0] for e in evts] == [12-left, 15-left, 20-left]    # __:opov
+    assert evts[2].rel == (5,0)    # __:opov
+    for hook in canvas._frame_hooks[:]:
+        hook()
+    assert evts[0].event is None
+    canvas.onMouseMove(_mouse_event(22, 10, 0))
+    evt = pg.event.get()[0]
+    assert evt in evts
+    assert evt.pos[0] == 22-left and evt.rel == (2,0)    # __:opov
+    assert 'rel' in str(evt) and '_relx' not in str(evt)
+    hook = pg.event._recycleHook
+    assert hook in canvas._frame_hooks
+    pg.event.set_pooling(False)
+    assert hook not in canvas._frame_hooks
+    assert pg.event.eventObj['keydown'] is keydown
+    pg.event.mouseEvt['pos'] = mouse_pos
+
+
+def test_event_replay():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    log = [1, [0.0, 16.0],
+           [[0, pg.KEYDOWN, [['key', pg.K_a], ['mod', 0], ['unicode', 'a']]],
+            [1, pg.KEYUP, [['key', pg.K_a], ['mod', 0], ['unicode', 'a']]]],
+           [[0, 16.0]]]
+    pg.event.clear()
+    replay = pg.replay.Replay(log)
+    replay.start()
+    assert replay.is_active()
+    evts = pg.event.get()
+    assert [e.type for e in evts] == [pg.KEYDOWN]    # __:opov
+    assert evts[0].key == pg.K_a
+    ticks = pg.time.get_ticks()
+    assert pg.time.get_ticks() == ticks
+    assert pg.time.Clock().tick() == 16.0
+    replay.stop()
+    assert not replay.is_active()
+    assert pg.time.get_ticks() >= ticks
+    pg.event.clear()
+
+
+def _mouse_event(x, y, buttons):
+    return {'type':'mousemove', 'clientX':x, 'clientY':y, 'buttons':buttons}
+
+
+def _touch_event(eventType, identifier, x, y):
+    touch = {'identifier':identifier, 'clientX':x, 'clientY':y}
+    touches = {'length':1, 'item':lambda i: touch}
+    return {'type':eventType, 'changedTouches':touches}
+
+
+class _TouchCallback:
+
+    def __init__(self):
+        self.moves = []
+
+    def onTouchStart(self, event):
+        pass
+
+    def onTouchEnd(self, event):
+        pass
+
+    def onTouchMove(self, event):
+        self.moves.append(event)
+
+    def onTouchCancel(self, event):
+        pass
@@ -0,0 +1,95 @@
+env = None
+pg = None
+
+
+def init(environ):
+    global env, pg
+    env = environ
+    pg = env['pg']
+    tests = [test_font_glyphatlas,
+             test_font_bitmapfont,
+             test_font_cache]
+    return tests
+
+
+def _drawn(surface, rect):
+    for y in range(rect.y, rect.y+rect.height):
+        for x in range(rect.x, rect.x+rect.width):
+            if surface.get_at((x,y)).a:
+                return True
+    return False
+
+
+def test_font_glyphatlas():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    font = pg.font.Font(None, 20)
+    atlas = pg.font.GlyphAtlas(font, (255,0,0))
+    assert len(atlas.glyphs) == 95
+    assert atlas.get(' ')[2] == 0
+    assert atlas.surface.get_height() > atlas.height
+    rects = []
+    for char in atlas.glyphs:
+        glyph = atlas.glyphs[char]
+        if glyph[2]:
+            rects.append(pg.Rect(glyph[0], glyph[1], glyph[2], atlas.height))
+    for i in range(len(rects)):
+        assert atlas.surface.get_rect().contains(rects[i])
+        for rect in rects[i+1:]:
+            assert not rects[i].colliderect(rect)
+    atlas.get('\u00e9')
+    assert len(atlas.glyphs) == 96
+
+
+def test_font_bitmapfont():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    font = pg.font.Font(None, 20)
+    bitmap = pg.font.BitmapFont(font, (255,0,0), 'AB')
+    assert len(bitmap.atlas.glyphs) == 2
+    size = bitmap.size('AB')
+    assert size[0] > 0 and size[1] == bitmap.atlas.height
+    assert len(bitmap.atlas.glyphs) == 2
+    surface = bitmap.render('AB')
+    assert surface.get_size() == size    # __:opov
+    assert _drawn(surface, surface.get_rect())
+    target = pg.Surface((100,60), pg.SRCALPHA)
+    rect = bitmap.render_to(target, (10,5), 'AB')
+    assert rect == (10,5,size[0],size[1])    # __:opov
+    assert _drawn(target, rect)
+    bitmap.render_many(target, [('A', (0,35)), ('BC', pg.Rect(50,35,1,1))])
+    assert 'C' in bitmap.atlas.glyphs
+    width = bitmap.size('A')[0]
+    assert _drawn(target, pg.Rect(0,35,width,bitmap.atlas.height))
+    width = bitmap.size('BC')[0]
+    assert _drawn(target, pg.Rect(50,35,width,bitmap.atlas.height))
+    assert not _drawn(target, pg.Rect(0,29,100,6))
+
+
+def test_font_cache():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    font = pg.font.Font(None, 20)
+    pg.font.clear_cache()
+    pg.font.set_cache(True, 2*32*32*4, 16)
+    for i in range(40):
+        font.size('text{}'.format(i))
+    stats = pg.font.get_cache_stats()
+    assert stats['size']['entries'] == 16
+    assert stats['size']['misses'] == 40 and stats['size']['hits'] == 0
+    font.size('text39')
+    font.size('text0')
+    stats = pg.font.get_cache_stats()
+    assert stats['size']['hits'] == 1 and stats['size']['misses'] == 41
+    surfs = [font.render('t{}'.format(i), True, (255,0,0)) for i in range(8)]
+    stats = pg.font.get_cache_stats()
+    assert stats['render']['misses'] == 8
+    assert stats['render']['bytes'] <= 2*32*32*4
+    assert stats['render']['entries'] < 8
+    assert font.render('t7', True, (255,0,0)) is surfs[7]
+    assert pg.font.get_cache_stats()['render']['hits'] == 1
+    pg.font.clear_cache()
+    stats = pg.font.get_cache_stats()
+    assert stats['size']['entries'] == 0 and stats['render']['entries'] == 0
+    assert stats['size']['hits'] == 0 and stats['render']['bytes'] == 0
+    pg.font.set_cache(False, 8*1024*1024, 1024)
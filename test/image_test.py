@@ -0,0 +1,40 @@
+env = None
+pg = None
+
+
+def init(environ):
+    global env, pg
+    env = environ
+    pg = env['pg']
+    tests = [test_image_build_atlas]
+    return tests
+
+
+def test_image_build_atlas():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    names = ['atlas_a.png', 'atlas_b.png', 'atlas_c.png']
+    sizes = [(10,5), (6,6), (4,12)]
+    images = {}
+    for i in range(len(names)):
+        surface = pg.Surface(sizes[i])
+        surface.fill((255,0,0))
+        images[names[i]] = surface.canvas
+    pg.image._register_images(images)
+    atlas = pg.image.build_atlas(names, max_size=16, padding=1)
+    surface_area = 0
+    for surface in atlas.surfaces:
+        assert surface.get_width() <= 16 and surface.get_height() <= 16
+        surface_area += surface.get_width() * surface.get_height()
+    assert atlas.get_efficiency() == (10*5 + 6*6 + 4*12) / surface_area
+    atlas_images = [atlas.get(name) for name in names]
+    for i in range(len(names)):
+        image = atlas_images[i]
+        assert image.get_size() == sizes[i]    # __:opov
+        assert image.surface.get_rect().contains(image.area)
+        for other in atlas_images[i+1:]:
+            if other.surface is image.surface:
+                assert not image.area.colliderect(other.area)
+    target = pg.Surface((6,6))
+    atlas.get('atlas_b.png').draw(target, (0,0))
+    assert target.get_at((3,3)) == (255,0,0,255)    # __:opov
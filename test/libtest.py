@@ -34,11 +34,14 @@ if platform is None:
 from test import surface_test
 from test import rect_test
 from test import draw_test
+from test import font_test
 from test import transform_test
 from test import surfarray_test
 from test import mask_test
 from test import color_test
 from test import cursor_test
+from test import display_test
+from test import image_test
 from test import sprite_test
 from test import event_test
 from test import time_test
@@ -94,11 +97,14 @@ class Log:
 lib_tests = [surface_test,
              rect_test,
              draw_test,
+             font_test,
              transform_test,
              surfarray_test,
              mask_test,
              color_test,
              cursor_test,
+             display_test,
+             image_test,
              sprite_test,
              event_test,
              time_test,
@@ -108,11 +114,14 @@ lib_tests = [surface_test,
 lib_test_name = {'surface_test': surface_test,
                  'rect_test': rect_test,
                  'draw_test': draw_test,
+                 'font_test': font_test,
                  'transform_test': transform_test,
                  'surfarray_test': surfarray_test,
                  'mask_test': mask_test,
                  'color_test': color_test,
                  'cursor_test': cursor_test,
+                 'display_test': display_test,
+                 'image_test': image_test,
                  'sprite_test': sprite_test,
                  'event_test': event_test,
                  'time_test': time_test,
@@ -8,7 +8,9 @@ def init(environ):
     pg = env['pg']
     tests = [test_mask,
              test_mask_from_surface,
-             test_mask_from_threshold]
+             test_mask_from_threshold,
+             test_mask_threshold_channel,
+             test_mask_bounds]
     return tests
 
 
@@ -28,6 +30,10 @@ def test_mask():
     assert bool(mask.overlap(mask, (5,5))) == False
     assert bool(mask.overlap(mask, (5,0))) == False
     assert bool(mask.overlap(mask, (0,5))) == False
+    assert mask.overlap(mask, (0,0)) == (0,0)    # __:opov
+    assert mask.overlap(mask, (2,2)) == (2,2)    # __:opov
+    assert mask.overlap(mask, (-3,-2)) == (0,0)    # __:opov
+    assert mask.overlap(mask, (5,0)) is None
     assert mask.get_at((8,0)) == 0
     mask.fill()
     assert mask.get_at((8,0)) == 1
@@ -102,3 +108,53 @@ def test_mask_from_threshold():
     else:
         assert mask.count() == 0
 
+
+def test_mask_threshold_channel():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    surface = pg.Surface((15,10),pg.SRCALPHA)
+    pg.draw.rect(surface, (200,40,90), (0,0,4,3))
+    pg.draw.rect(surface, (90,40,200), (5,0,4,3))
+    pg.draw.rect(surface, (200,40,90,100), (10,0,4,3))
+    mask = pg.mask.from_threshold(surface, (200,40,90), (5,5,5,128))
+    assert mask.count() == 12
+    assert mask.get_at((0,0)) == 1
+    assert mask.get_at((5,0)) == 0 and mask.get_at((10,0)) == 0
+    mask = pg.mask.from_threshold(surface, (90,40,200), (5,5,5,128))
+    assert mask.count() == 12
+    assert mask.get_at((5,0)) == 1 and mask.get_at((0,0)) == 0
+    mask = pg.mask.from_threshold(surface, (200,40,90), (5,5,5,50))
+    assert mask.count() == 24
+    assert mask.get_at((10,0)) == 1 and mask.get_at((5,0)) == 0
+    mask = pg.mask.from_threshold(surface, (200,90,40), (5,5,5,128))
+    assert mask.count() == 0
+
+
+def test_mask_bounds():
+    mask = pg.mask.Mask((40,3))
+    for pos in ((40,0), (0,3), (-1,0), (0,-1)):
+        try:
+            mask.get_at(pos)
+            assert False
+        except IndexError:
+            pass
+        try:
+            mask.set_at(pos)
+            assert False
+        except IndexError:
+            pass
+    assert mask.count() == 0
+    mask.set_at((39,2))
+    assert mask.get_at((39,2)) == 1
+    if env['library'] != 'pyjsdl-ts':
+        return None
+    mask.set_at((33,1))
+    bit = mask.bit
+    assert len(bit) == 3
+    assert bit[1].get(33) and not bit[1].get(32) and not bit[0].get(33)
+    assert bit[2].get(39)
+    bit[0].set(35)
+    assert mask.get_at((35,0)) == 1
+    bit[1].set(33, 0)
+    assert mask.get_at((33,1)) == 0
+    assert mask.count() == 2
@@ -7,7 +7,13 @@ def init(environ):
     env = environ
     pg = env['pg']
     tests = [test_sprite,
-             test_sprite_group]
+             test_sprite_group,
+             test_sprite_group_membership,
+             test_sprite_orderedupdates,
+             test_sprite_layeredupdates,
+             test_sprite_collide_mask,
+             test_sprite_spatialgroup,
+             test_sprite_layereddirty]
     return tests
 
 
@@ -104,3 +110,164 @@ def test_sprite_group():
             assert g.has([s[0],s[1],s[2]]) == r[2]
             assert g.has([s[2],s[5]],s[6]) == r[3]
 
+
+
+def test_sprite_group_membership():
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(5)]
+    group = pg.sprite.Group(s[:3])
+    assert len(group.sprites()) == 3
+    group.add(s[3])
+    assert len(group.sprites()) == 4 and s[3] in group.sprites()
+    group.remove(s[0])
+    assert len(group.sprites()) == 3 and s[0] not in group.sprites()
+    assert len(group) == 3
+    assert group.has(s[1], s[2], s[3]) and not group.has(s[0])
+    assert s[1] in group and s[0] not in group
+    assert group in s[1].groups() and group not in s[0].groups()
+    grp = group.copy()
+    assert len(grp.sprites()) == 3 and grp.has(s[1:4])
+    grp.remove(s[1])
+    assert not grp.has(s[1]) and len(grp.sprites()) == 2
+    assert group.has(s[1]) and len(group.sprites()) == 3
+    s[4].add(group)
+    assert group.has(s[4]) and len(group.sprites()) == 4
+    s[4].kill()
+    assert not group.has(s[4]) and s[4] not in group.sprites()
+    group.empty()
+    assert len(group.sprites()) == 0 and len(s[1].groups()) == 0
+
+
+def test_sprite_orderedupdates():
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(60)]
+    group = pg.sprite.OrderedUpdates(s[:50])
+    group.remove(s[10:20])
+    order = list(range(10)) + list(range(20,50))    # __:opov
+    assert _order(group, s) == order    # __:opov
+    assert len(group) == 40
+    group.remove(s[21:49])
+    order = list(range(10)) + [20, 49]    # __:opov
+    assert _order(group, s) == order    # __:opov
+    group.add(s[50:60], s[10:12])
+    order = order + list(range(50,60)) + [10, 11]    # __:opov
+    assert _order(group, s) == order    # __:opov
+    assert len(group) == len(order) and len(group.sprites()) == len(order)
+    group.remove(s[49], s[11])
+    group.add(s[49])
+    order = list(range(10)) + [20] + list(range(50,60)) + [10, 49]    # __:opov
+    assert _order(group, s) == order    # __:opov
+    assert _order(group.copy(), s) == order    # __:opov
+
+
+def test_sprite_layeredupdates():
+    Sprite = pg.sprite.Sprite
+    s = []
+    for i in range(6):
+        sprite = Sprite()
+        sprite.rect = pg.Rect(i*10, 0, 10, 10)
+        s.append(sprite)
+    group = pg.sprite.LayeredUpdates()
+    group.add(s[0], s[1], layer=1)
+    group.add(s[2], s[3], layer=0)
+    group.add(s[4], s[5], layer=2)
+    assert _order(group, s) == [2, 3, 0, 1, 4, 5]    # __:opov
+    assert group.layers() == [0, 1, 2]    # __:opov
+    group.change_layer(s[2], 1)
+    assert _order(group, s) == [3, 0, 1, 2, 4, 5]    # __:opov
+    assert group.get_layer_of_sprite(s[2]) == 1
+    group.move_to_front(s[0])
+    assert _order(group, s) == [3, 1, 2, 4, 5, 0]    # __:opov
+    assert group.get_top_sprite() is s[0]
+    assert group.get_layer_of_sprite(s[0]) == 2
+    group.move_to_back(s[5])
+    assert _order(group, s) == [5, 3, 1, 2, 4, 0]    # __:opov
+    assert group.layers() == [-1, 0, 1, 2]    # __:opov
+    group.change_layer(s[3], 1)
+    assert _order(group, s) == [5, 1, 2, 3, 4, 0]    # __:opov
+    assert group.layers() == [-1, 1, 2]    # __:opov
+    s[4].rect.x = 0
+    sprites = group.get_sprites_at((5,5))
+    assert [s.index(sprite) for sprite in sprites] == [4, 0]    # __:opov
+    group.move_to_back(s[0])
+    sprites = group.get_sprites_at((5,5))
+    assert [s.index(sprite) for sprite in sprites] == [0, 4]    # __:opov
+    assert group.get_top_sprite() is s[4]
+    assert _order(group.copy(), s) == [0, 5, 1, 2, 3, 4]    # __:opov
+
+
+def _order(group, sprites):
+    return [sprites.index(sprite) for sprite in group.sprites()]
+
+
+def test_sprite_collide_mask():
+    Sprite = pg.sprite.Sprite
+    sprites = []
+    for pos in ((0,0), (3,3)):
+        sprite = Sprite()
+        sprite.image = pg.Surface((5,5), pg.SRCALPHA)
+        pg.draw.rect(sprite.image, (10,20,30), (0,0,2,2))
+        sprite.rect = pg.Rect(pos[0], pos[1], 5, 5)
+        sprites.append(sprite)
+    assert pg.sprite.collide_mask(sprites[0], sprites[1]) is None
+    pg.draw.rect(sprites[0].image, (10,20,30), (3,3,2,2))
+    assert pg.sprite.collide_mask(sprites[0], sprites[1]) == (3,3)    # __:opov
+
+
+def test_sprite_spatialgroup():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    Sprite = pg.sprite.Sprite
+    sprites = []
+    for i in range(10):
+        sprite = Sprite()
+        sprite.rect = pg.Rect(i*20, 0, 10, 10)
+        sprites.append(sprite)
+    group = pg.sprite.SpatialGroup(sprites, cell_size=16)
+    probe = Sprite()
+    probe.rect = pg.Rect(35, 5, 10, 10)
+    assert len(pg.sprite.spritecollide(probe, group, False)) == 1
+    assert pg.sprite.spritecollideany(probe, group)
+    sprites[0].rect.x = 38
+    group.reindex(sprites[0])
+    assert len(pg.sprite.spritecollide(probe, group, False)) == 2
+    group.update()
+    assert len(pg.sprite.spritecollide(probe, group, False)) == 2
+    group.remove(sprites[2])
+    assert len(pg.sprite.spritecollide(probe, group, False)) == 1
+    sprites[0].rect.x = 0
+    pg.env.canvas._frame += 1
+    assert not pg.sprite.spritecollideany(probe, group)
+    sprites[1].rect.x = 30
+    pg.env.canvas._frame += 1
+    collide = pg.sprite.groupcollide([probe], group, False, False)
+    assert len(collide.get(probe)) == 1
+
+
+def test_sprite_layereddirty():
+    DirtySprite = pg.sprite.DirtySprite
+    surface = pg.Surface((50,50))
+    background = pg.Surface((50,50))
+    background.fill((0,0,255))
+    surface.blit(background, (0,0))
+    sprites = []
+    for pos in ((0,0), (30,30)):
+        sprite = DirtySprite()
+        sprite.image = pg.Surface((10,10))
+        sprite.image.fill((255,0,0))
+        sprite.rect = pg.Rect(pos[0], pos[1], 10, 10)
+        sprites.append(sprite)
+    group = pg.sprite.LayeredDirty(sprites)
+    group.clear(surface, background)
+    group.draw(surface)
+    assert sprites[0].dirty == 0
+    assert surface.get_at((35,35)) == (255,0,0,255)    # __:opov
+    sprites[1].rect.x = 10
+    sprites[1].dirty = 1
+    group.draw(surface)
+    assert surface.get_at((35,35)) == (0,0,255,255)    # __:opov
+    assert surface.get_at((15,35)) == (255,0,0,255)    # __:opov
+    sprites[0].visible = 0
+    assert sprites[0].dirty == 1
+    group.draw(surface)
+    assert surface.get_at((5,5)) == (0,0,255,255)    # __:opov
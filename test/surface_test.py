@@ -20,7 +20,8 @@ def init(environ):
              test_surface_set_colorkey,
              test_surface_get_colorkey,
              test_surface_set_at,
-             test_surface_get_at]
+             test_surface_get_at,
+             test_surface_context_state]
     return tests
 
 
@@ -96,3 +97,40 @@ def test_surface_get_at():
     assert surface.get_at((0,0)) == (0,0,255,255)    # __:opov
     assert surface.get_at((0,0)) == (0,0,255)    # __:opov
 
+
+def test_surface_context_state():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    surf = pg.Surface((10,10))
+    surf.setFillStyle('#ff0000')
+    surf.saveContext()
+    surf.setFillStyle('#0000ff')
+    surf.fillRect(0, 0, 5, 5)
+    surf.restoreContext()
+    surf.setFillStyle('#ff0000')
+    surf.fillRect(5, 0, 5, 5)
+    assert surf.get_at((2,2)) == (0,0,255,255)    # __:opov
+    assert surf.get_at((7,2)) == (255,0,0,255)    # __:opov
+    surf.setFillStyle('#0000ff')
+    surf.fillRect(0, 5, 5, 5)
+    assert surf.get_at((2,7)) == (0,0,255,255)    # __:opov
+    surf.saveContext()
+    surf.setGlobalAlpha(0.0)
+    surf.setGlobalCompositeOperation('destination-out')
+    surf.restoreContext()
+    surf.setGlobalAlpha(1.0)
+    surf.setGlobalCompositeOperation('source-over')
+    surf.setFillStyle('#00ff00')
+    surf.fillRect(5, 5, 5, 5)
+    assert surf.get_at((7,7)) == (0,255,0,255)    # __:opov
+    surf.setGlobalAlpha(0.0)
+    surf.setGlobalAlpha(1.0)
+    surf.setGlobalCompositeOperation('destination-out')
+    surf.setGlobalCompositeOperation('source-over')
+    pg.draw.rect(surf, (255,0,0), (0,0,5,5))
+    assert surf.get_at((2,2)) == (255,0,0,255)    # __:opov
+    surf.setFillStyle('#00ff00')
+    surf.resize(20, 20)
+    surf.setFillStyle('#00ff00')
+    surf.fillRect(0, 0, 20, 20)
+    assert surf.get_at((15,15)) == (0,255,0,255)    # __:opov
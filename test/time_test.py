@@ -9,7 +9,8 @@ def init(environ):
     pg = env['pg']
     tests = [test_time_delay,
              test_time_wait,
-             test_time_timer]
+             test_time_timer,
+             test_time_wheel]
     return tests
 
 
@@ -65,3 +66,51 @@ def test_time_timer():
             wait = 0
             return False
 
+
+def test_time_wheel():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    wheel = pg.time._wheel.__class__()
+    wheel.canvas = pg.env.canvas
+    calls = []
+    ids = [wheel.schedule(lambda: calls.append(0), 20),
+           wheel.schedule(lambda: calls.append(1), 40, 40),
+           wheel.schedule(lambda: calls.append(2), 500),
+           wheel.schedule(lambda: calls.append(3), 1000),
+           wheel.schedule(lambda: calls.append(4), 20000)]
+    assert wheel.counts == [2, 2, 1, 0]    # __:opov
+    wheel.cancel(ids[2])
+    assert wheel.counts == [2, 1, 1, 0]    # __:opov
+    t = pg.time.time()
+    wheel.advance(t + 100)
+    assert calls == [0, 1]    # __:opov
+    wheel.advance(t + 1100)
+    assert calls == [0, 1, 1, 3]    # __:opov
+    wheel.advance(t + 20100)
+    assert calls == [0, 1, 1, 3, 1, 4]    # __:opov
+    assert wheel.timers.size == 1
+    wheel.cancel(ids[1])
+    wheel.advance(t + 20200)
+    assert wheel.timers.size == 0 and wheel.fallback is None
+    assert wheel.counts == [0, 0, 0, 0]    # __:opov
+    wheel.canvas = None
+    id = wheel.schedule(lambda: None, 20)
+    assert wheel.canvas is pg.env.canvas
+    assert wheel.hook in pg.env.canvas._frame_hooks
+    pg.env.canvas._frame_hooks.remove(wheel.hook)
+    wheel.canvas = None
+    wheel.schedule(lambda: None, 20)
+    assert wheel.hook in pg.env.canvas._frame_hooks
+    pg.env.canvas._frame_hooks.remove(wheel.hook)
+    assert wheel.hook not in pg.env.canvas._frame_hooks
+    wheel.cancel(id)
+    wheel.cancel(id + 1)
+    event = pg.USEREVENT + 1
+    pg.time.set_timer(event, 50)
+    timer = pg.time._timers[event]
+    assert pg.time._wheel.timers.has(timer.timer)
+    pg.time.set_timer(event, 0)
+    assert timer.timer is None
+    pg.time.set_timer(event, 50, True)
+    assert pg.time._wheel.timers.js_get(timer.timer).period == 0
+    pg.time.set_timer(event, 0)
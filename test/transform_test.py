@@ -15,7 +15,9 @@ def init(environ):
     tests = [test_transform_rotate,
              test_transform_rotozoom,
              test_transform_scale,
-             test_transform_flip]
+             test_transform_flip,
+             test_transform_cache,
+             test_transform_rotation_sheet]
     return tests
 
 
@@ -63,3 +65,37 @@ def test_transform_flip():
     assert surf.get_size() == (width, height)    # __:opov
     assert surf.get_at((5,5)).r == 0 and surf.get_at((width-5,5)).r == 255
 
+
+
+def test_transform_cache():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    surface.fill((0,0,0))
+    surface.fill((255,0,0), (0,0,width//2,height))
+    pg.transform.clear_cache()
+    pg.transform.set_cache(True)
+    surf = pg.transform.rotate(surface, 180)
+    assert pg.transform.rotate(surface, 180.2) is surf
+    assert surf.get_at((5,5)).r == 0 and surf.get_at((width-5,5)).r == 255
+    surface.fill((0,255,0), (0,0,width//2,height))
+    assert pg.transform.rotate(surface, 180) is not surf
+    pg.transform.set_cache(False)
+    assert pg.transform.cached_rotate(surface, 90) is pg.transform.cached_rotate(surface, 90.4)
+    stats = pg.transform.get_cache_stats()
+    assert stats['hits'] == 2 and stats['misses'] == 2
+    pg.transform.clear_cache()
+
+
+def test_transform_rotation_sheet():
+    if env['library'] != 'pyjsdl-ts':
+        raise NotImplementedError
+    surface.fill((0,0,0))
+    surface.fill((255,0,0), (0,0,width//2,height))
+    sheet = pg.transform.rotation_sheet(surface, 8)
+    assert sheet.is_baked()
+    assert sheet.get_index(181) == 4 and sheet.get_index(-44) == 7
+    sheet_surface, area = sheet.get(180)
+    assert area.size == (width, height)    # __:opov
+    surf = pg.Surface((width, height), pg.SRCALPHA)
+    surf.blit(sheet_surface, (0,0), area)
+    assert surf.get_at((5,5)).r == 0 and surf.get_at((width-5,5)).r == 255